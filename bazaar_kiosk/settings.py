@@ -1,6 +1,7 @@
 #BAZAAR_KIOSK/bazaar_kiosk/setting.py
 from pathlib import Path
 import os
+import tempfile
 from urllib.parse import urlparse, parse_qs, unquote
 
 # --- 기본 경로/디버그 ---
@@ -35,9 +36,11 @@ INSTALLED_APPS = [
 
 # --- 미들웨어 ---
 MIDDLEWARE = [
+    "orders.middleware.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "orders.middleware.TrafficCaptureMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -86,13 +89,65 @@ if _db_url:
     DATABASES = {"default": _parse_database_url(_db_url)}
 else:
     DATABASES = {
-        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"}
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # 쓰기 트랜잭션을 처음부터 잠가(BEGIN IMMEDIATE) 동시 쓰기가 잠금 승격에서 실패하지 않고 기다리게 한다.
+            "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+            # 스레드 동시성 테스트가 공유 메모리 DB의 테이블 잠금에 걸리지 않도록 테스트 DB는 파일로 만든다.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        }
     }
 
+# --- 캐시: 카탈로그(메뉴/테이블)는 워커 간 공유되는 파일 캐시 사용(Redis 불필요) ---
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "catalog": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "CATALOG_CACHE_DIR", str(Path(tempfile.gettempdir()) / "bazaar_kiosk_catalog")
+        ),
+    },
+}
+
 # --- Supabase realtime ---
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
 
+# --- 주문 스트림(SSE): Supabase 미설정 시 주방 화면이 사용 ---
+ORDERS_STREAM_POLL_SECONDS = float(os.environ.get("ORDERS_STREAM_POLL_SECONDS", "1.0"))
+ORDERS_STREAM_MAX_SECONDS = float(os.environ.get("ORDERS_STREAM_MAX_SECONDS", "300"))
+# 프로세스당 동시 스트림 수. 스트림 하나가 요청 스레드 하나를 최대 MAX_SECONDS 동안 점유하므로
+# gunicorn 기본 sync 워커에서는 0(스트림 끔, 화면은 delta 폴링)으로 둔다. 스트림을 쓰려면
+# `gunicorn -k gthread --threads 8`처럼 스레드 워커로 띄우고 threads보다 작게 설정한다(예: 4).
+ORDERS_STREAM_MAX_PER_PROCESS = int(os.environ.get("ORDERS_STREAM_MAX_PER_PROCESS", "4" if DEBUG else "0"))
+
+# --- API JSON 인코더: auto(orjson 사용, requirements.txt에 포함) / orjson / stdlib ---
+ORDERS_JSON_BACKEND = os.environ.get("ORDERS_JSON_BACKEND", "auto")
+
+# --- 주문번호 블록 선할당: 프로세스마다 N개씩 미리 예약(0/1이면 주문마다 할당) ---
+ORDERS_NUMBER_BLOCK_SIZE = int(os.environ.get("ORDERS_NUMBER_BLOCK_SIZE", "0"))
+
+# --- 주문 POST Idempotency-Key 보관 시간 ---
+ORDERS_IDEMPOTENCY_TTL_HOURS = float(os.environ.get("ORDERS_IDEMPOTENCY_TTL_HOURS", "24"))
+
+# --- 요청 계측(옵트인): Server-Timing 헤더 + URL 이름별 p50/p95/p99(프로세스 메모리, 최근 1~2개 창) ---
+# 비용은 bench_request_timing으로 잰다. 켜면 요청마다 쿼리 래퍼와 기록 비용이 더해진다.
+ORDERS_REQUEST_TIMING = os.environ.get("ORDERS_REQUEST_TIMING", "0") == "1"
+ORDERS_TIMING_WINDOW_SECONDS = float(os.environ.get("ORDERS_TIMING_WINDOW_SECONDS", "300"))
+
+# --- /orders/metrics(Prometheus): Bearer 토큰 또는 세션 역할로 조회 ---
+# 워커 합산: ORDERS_METRICS_DIR에 워커별 파일을 쓴다(gunicorn 워커가 공유하는 로컬 경로, 배포 시 비울 것).
+ORDERS_METRICS_DIR = os.environ.get("ORDERS_METRICS_DIR", "")
+ORDERS_METRICS_FLUSH_SECONDS = float(os.environ.get("ORDERS_METRICS_FLUSH_SECONDS", "1.0"))
+ORDERS_METRICS_TOKEN = os.environ.get("ORDERS_METRICS_TOKEN", "")
+ORDERS_METRICS_ROLES = _split_csv("ORDERS_METRICS_ROLES") or ["B1_COUNTER"]
+
+# --- 트래픽 캡처(옵트인): 경로를 지정하면 API 요청을 JSONL로 남긴다(replay_traffic으로 재생) ---
+ORDERS_CAPTURE_PATH = os.environ.get("ORDERS_CAPTURE_PATH", "")
+ORDERS_CAPTURE_PREFIXES = _split_csv("ORDERS_CAPTURE_PREFIXES") or ["/orders/api/", "/orders/menus/", "/orders/tables/"]
+ORDERS_CAPTURE_MAX_BODY = int(os.environ.get("ORDERS_CAPTURE_MAX_BODY", "65536"))
+
 # --- 정적 파일(WhiteNoise) ---
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
@@ -2,7 +2,8 @@ from __future__ import annotations
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Table, MenuItem, Order, OrderItem
+from .models import Table, MenuItem, Order, OrderItem, OrderChange, OrderStatus
+from .services.progress import set_order_status
 
 # ---- 공용 유틸: 모델에 실제 존재하는 필드만 골라서 사용 ----
 def _field_names(model):
@@ -43,11 +44,17 @@ class MenuItemAdmin(admin.ModelAdmin):
 
 # ---- Order / OrderItem ----
 class OrderItemInline(admin.TabularInline):
+    # 품목은 주문 카운터(total_qty/remaining_qty 등)와 함께 API에서만 바뀌므로 관리자에서는 보기만 한다.
     model = OrderItem
     extra = 0
-    fields = _present(OrderItem, "menu_item", "qty", "unit_price")
-    readonly_fields = _present(OrderItem, )
-    autocomplete_fields = _present(OrderItem, "menu_item")
+    fields = _present(OrderItem, "menu_item", "qty", "unit_price", "prepared_qty")
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -75,7 +82,7 @@ class OrderAdmin(admin.ModelAdmin):
         )
         return tuple(base)
 
-    # 상세 화면 필드 구성(최소 필드만, 나머지는 자동으로 인라인에서 편집)
+    # 상세 화면 필드 구성(최소 필드만, 품목은 인라인에서 조회만)
     fields = (
         _present(Order,
                  "order_type", "status", "table",
@@ -85,3 +92,42 @@ class OrderAdmin(admin.ModelAdmin):
                  "created_at", "updated_at")
         or ["id"]  # 안전망
     )
+
+    def has_add_permission(self, request):
+        # 주문은 번호/카운터/메뉴 집계/변경 로그를 함께 쓰는 API(키오스크·POS)에서만 만든다.
+        return False
+
+    def save_model(self, request, obj, form, change):
+        # 상태 변경은 API와 같은 서비스로 보내 메뉴 집계/매출 롤업/변경 로그(SSE)를 함께 옮긴다.
+        new_status = obj.status
+        if change and "status" in form.changed_data:
+            obj.status = form.initial["status"]
+        super().save_model(request, obj, form, change)
+        if change and obj.status != new_status:
+            obj.status = set_order_status(obj.pk, new_status).status
+
+    # 삭제 전에 취소로 돌려 메뉴 집계/매출 롤업에서 빼고, 변경 로그로 보드에서도 내린다.
+    def delete_model(self, request, obj):
+        if obj.status != OrderStatus.CANCELLED:
+            set_order_status(obj.pk, OrderStatus.CANCELLED)
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        for pk in queryset.exclude(status=OrderStatus.CANCELLED).values_list("pk", flat=True):
+            set_order_status(pk, OrderStatus.CANCELLED)
+        super().delete_queryset(request, queryset)
+
+
+# ---- 변경 로그(읽기 전용) ----
+@admin.register(OrderChange)
+class OrderChangeAdmin(admin.ModelAdmin):
+    list_display = ("seq", "order_id", "item_id", "kind", "status", "prepared_qty", "created_at")
+    list_filter = ("kind", "status")
+    search_fields = ("order__id",)
+    ordering = ("-seq",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
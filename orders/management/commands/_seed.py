@@ -0,0 +1,88 @@
+# 벤치마크 명령과 테스트가 함께 쓰는 합성 주문 데이터
+from __future__ import annotations
+import random
+from datetime import timedelta
+from typing import List
+
+from django.db.models import Max
+from django.utils import timezone
+
+from orders.models import (
+    MenuItem, Order, OrderItem, OrderStatus, OrderType, PaymentMethod, Table,
+)
+from orders.services.progress import counters_for_items
+
+MENU_NAMES = ["떡볶이", "순대", "김밥", "어묵", "라면", "튀김", "주먹밥", "식혜"]
+
+
+def _ensure_catalog() -> tuple[list[Table], list[MenuItem]]:
+    tables = list(Table.objects.filter(is_active=True)[:40])
+    if not tables:
+        start = (Table.objects.aggregate(n=Max("number"))["n"] or 0) + 1
+        tables = Table.objects.bulk_create(
+            [Table(number=start + i, name=f"벤치 {i + 1}") for i in range(20)]
+        )
+    menus = list(MenuItem.objects.filter(is_active=True)[:20])
+    if not menus:
+        menus = MenuItem.objects.bulk_create(
+            [MenuItem(name=name, price=3000 + 500 * i, sort_index=i) for i, name in enumerate(MENU_NAMES)]
+        )
+    return tables, menus
+
+
+def seed_orders(count: int, *, items_per_order: int = 3, days: int = 1, seed: int = 7) -> List[int]:
+    """
+    Insert ``count`` orders (with items) spread over the last ``days`` days.
+
+    Callers run this inside a transaction they roll back afterwards.
+    """
+    rnd = random.Random(seed)
+    tables, menus = _ensure_catalog()
+    now = timezone.now()
+    statuses = [OrderStatus.PREPARING] * 3 + [OrderStatus.READY] * 6 + [OrderStatus.CANCELLED]
+    ids: List[int] = []
+    batch = 2000
+    for start in range(0, count, batch):
+        size = min(batch, count - start)
+        orders = []
+        lines = []
+        for _ in range(size):
+            created = now - timedelta(minutes=rnd.randint(0, days * 24 * 60 - 1))
+            order_type = rnd.choice([OrderType.DINE_IN, OrderType.TAKEOUT])
+            order = Order(
+                order_type=order_type,
+                status=rnd.choice(statuses),
+                table=rnd.choice(tables),
+                is_takeout=order_type == OrderType.TAKEOUT,
+                payment_method=rnd.choice([PaymentMethod.CASH, PaymentMethod.TICKET]),
+                received_amount=20000,
+                order_date=timezone.localdate(created),
+                note=rnd.choice(["", "", "덜 맵게", "포장 따로"]),
+            )
+            items = []
+            for _ in range(rnd.randint(1, items_per_order * 2 - 1)):
+                menu = rnd.choice(menus)
+                qty = rnd.randint(1, 4)
+                items.append(OrderItem(
+                    menu_item=menu, qty=qty, unit_price=menu.price,
+                    prepared_qty=qty if order.status == OrderStatus.READY else rnd.randint(0, qty),
+                    service_mode=rnd.choice([order_type, order_type, OrderType.TAKEOUT]),
+                ))
+            order.total_price = sum(i.qty * i.unit_price for i in items)
+            for field, value in counters_for_items(items).items():
+                setattr(order, field, value)
+            orders.append((order, created))
+            lines.append(items)
+        created_orders = Order.objects.bulk_create([o for o, _ in orders])
+        # auto_now_add를 덮어써서 시간대를 고르게 분포시킨다.
+        for (order, created), saved in zip(orders, created_orders):
+            saved.created_at = created
+        Order.objects.bulk_update(created_orders, ["created_at"], batch_size=batch)
+        item_objs = []
+        for saved, items in zip(created_orders, lines):
+            for item in items:
+                item.order = saved
+                item_objs.append(item)
+        OrderItem.objects.bulk_create(item_objs, batch_size=batch)
+        ids.extend(o.id for o in created_orders)
+    return ids
@@ -0,0 +1,61 @@
+from __future__ import annotations
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from orders.models import Order
+from orders.services.order_rows import serialize_order_rows
+from orders.views.responses import BACKENDS
+from ._seed import seed_orders
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _dumps_jsonresponse(data) -> bytes:
+    # 기존 JsonResponse 기본 동작(ASCII 이스케이프, 기본 구분자)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+class Command(BaseCommand):
+    help = "주문 보드 응답(기본 200건)으로 JSON 인코더 백엔드를 비교합니다(데이터는 롤백)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, orders: int, repeat: int, **options):
+        try:
+            with transaction.atomic():
+                ids = seed_orders(orders)
+                board = {
+                    "results": serialize_order_rows(
+                        Order.objects.filter(id__in=ids).order_by("-created_at", "-id")
+                    ),
+                    "count": len(ids),
+                }
+                self._bench(board, repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _bench(self, board, repeat: int) -> None:
+        candidates = {"jsonresponse": _dumps_jsonresponse} | BACKENDS
+        baseline = json.loads(_dumps_jsonresponse(board))
+        for label, fn in candidates.items():
+            body = fn(board)
+            same = json.loads(body) == baseline
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn(board)
+                samples.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{label:<13} {statistics.median(samples):8.3f}ms  {len(body):>8,} bytes"
+                f"  {'동일' if same else '불일치'}"
+            )
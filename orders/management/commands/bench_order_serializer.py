@@ -0,0 +1,63 @@
+from __future__ import annotations
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from orders.models import Order
+from orders.services.order_rows import serialize_order_rows
+from orders.views.api import _order_base_queryset, _serialize_order
+from ._seed import seed_orders
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "모델 기반 직렬화와 values() 기반 직렬화의 속도/결과를 비교합니다(데이터는 롤백)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, sizes, repeat: int, **options):
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    self._bench(size, repeat)
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _bench(self, size: int, repeat: int) -> None:
+        ids = seed_orders(size)
+
+        def model_path():
+            qs = _order_base_queryset().filter(id__in=ids).order_by("-created_at", "-id")
+            return [_serialize_order(o) for o in qs]
+
+        def values_path():
+            return serialize_order_rows(Order.objects.filter(id__in=ids).order_by("-created_at", "-id"))
+
+        dump = lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+        if dump(model_path()) != dump(values_path()):
+            raise CommandError(f"{size}건: 두 직렬화 결과가 다릅니다.")
+
+        results = {}
+        for label, fn in (("model", model_path), ("values", values_path)):
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - started) * 1000)
+            results[label] = statistics.median(samples)
+
+        speedup = results["model"] / results["values"] if results["values"] else 0.0
+        self.stdout.write(
+            f"{size:>4}건  model {results['model']:8.2f}ms  values {results['values']:8.2f}ms  "
+            f"x{speedup:.1f}  (동일 JSON 확인)"
+        )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from orders.middleware import RequestTimingMiddleware
+from orders.models import Order
+from ._seed import seed_orders
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "RequestTimingMiddleware가 요청마다 더하는 시간을 엔드포인트 처리 시간과 비교합니다(데이터는 롤백)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=2000, help="측정당 호출 수")
+        parser.add_argument("--rounds", type=int, default=7)
+
+    def handle(self, *args, orders: int, requests: int, rounds: int, **options):
+        try:
+            with transaction.atomic():
+                ids = seed_orders(orders)
+                order_id = Order.objects.filter(id__in=ids).values_list("id", flat=True).first()
+                paths = {
+                    "order list": "/orders/api/orders/?limit=50",
+                    "order detail": f"/orders/api/orders/{order_id}/detail",
+                    "menus": "/orders/menus/",
+                }
+                # DEBUG 쿼리 기록은 운영에 없으므로 끄고 잰다.
+                with override_settings(ORDERS_REQUEST_TIMING=False, DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+                    for label, path in paths.items():
+                        self._bench(label, path, requests, rounds)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _bench(self, label: str, path: str, requests: int, rounds: int) -> None:
+        # 1) 미들웨어 없이 엔드포인트 한 번의 처리 시간, 쿼리 수, 본문 크기
+        client = Client()
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f"{path} 응답 {response.status_code}")
+        queries, body = len(ctx.captured_queries), response.content
+        view_ms = self._median(rounds, max(1, requests // 20), lambda: client.get(path))
+
+        # 2) 같은 쿼리 수·본문 크기의 빈 뷰를 미들웨어로 감쌌을 때와 아닐 때의 차이
+        request = RequestFactory().get(path)
+        match = resolve(request.path_info)
+
+        def stub(req):
+            req.resolver_match = match
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute("SELECT 1")
+            return HttpResponse(body)
+
+        wrapped = RequestTimingMiddleware.__new__(RequestTimingMiddleware)
+        wrapped.get_response = stub
+        bare_ms = self._median(rounds, requests, lambda: stub(request))
+        timed_ms = self._median(rounds, requests, lambda: wrapped(request))
+        overhead_us = (timed_ms - bare_ms) * 1000
+        self.stdout.write(
+            f"{label:<13} 요청 {view_ms:7.3f}ms  쿼리 {queries:>2}개  {len(body):>7,} bytes  "
+            f"계측 {overhead_us:6.1f}us ({overhead_us / 10 / view_ms:5.2f}%)"
+        )
+
+    @staticmethod
+    def _median(rounds: int, calls: int, fn) -> float:
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            samples.append((time.perf_counter() - started) * 1000 / calls)
+        return statistics.median(samples)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders.models import SalesHourly, SalesMenuDaily
+from orders.services.sales import (
+    HOURLY_KEY, HOURLY_VALUES, MENU_VALUES, aggregate_sales, stored_sales,
+)
+
+
+def _mismatches(expected: dict, stored: dict, width: int) -> list:
+    zero = (0,) * width
+    return sorted(
+        key for key in expected.keys() | stored.keys()
+        if tuple(expected.get(key, zero)) != tuple(stored.get(key, zero))
+    )
+
+
+class Command(BaseCommand):
+    help = "매출 롤업(SalesHourly/SalesMenuDaily)을 원본 주문과 대조하고, --fix로 틀린 행을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", help="YYYY-MM-DD (생략 시 처음부터)")
+        parser.add_argument("--end-date", help="YYYY-MM-DD (생략 시 끝까지)")
+        parser.add_argument("--fix", action="store_true", help="불일치 행을 원본 기준 값으로 덮어씁니다.")
+
+    def handle(self, *args, start_date: str | None, end_date: str | None, fix: bool, **options):
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+            end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        except ValueError:
+            raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+        exp_hourly, exp_menu = aggregate_sales(start, end)
+        got_hourly, got_menu = stored_sales(start, end)
+        bad_hourly = _mismatches(exp_hourly, got_hourly, len(HOURLY_VALUES))
+        bad_menu = _mismatches(exp_menu, got_menu, len(MENU_VALUES))
+
+        if not fix:
+            for key in bad_hourly[:10]:
+                self.stdout.write(f"시간별 불일치 {key}: 저장={got_hourly.get(key)} 실제={exp_hourly.get(key)}")
+            for key in bad_menu[:10]:
+                self.stdout.write(f"메뉴별 불일치 {key}: 저장={got_menu.get(key)} 실제={exp_menu.get(key)}")
+            if bad_hourly or bad_menu:
+                raise CommandError(f"롤업 불일치: 시간별 {len(bad_hourly)}건, 메뉴별 {len(bad_menu)}건")
+            self.stdout.write(self.style.SUCCESS(
+                f"시간별 {len(exp_hourly)}행, 메뉴별 {len(exp_menu)}행 검증, 불일치 없음"
+            ))
+            return
+
+        # 동시에 들어온 증분 갱신과 부딪히지 않도록 틀린 행만 덮어쓴다(없어진 행은 0으로).
+        zero_h, zero_m = (0,) * len(HOURLY_VALUES), (0,) * len(MENU_VALUES)
+        with transaction.atomic():
+            SalesHourly.objects.bulk_create(
+                [
+                    SalesHourly(**dict(zip(HOURLY_KEY + HOURLY_VALUES, key + tuple(exp_hourly.get(key, zero_h)))))
+                    for key in bad_hourly
+                ],
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=list(HOURLY_KEY),
+                update_fields=list(HOURLY_VALUES),
+            )
+            SalesMenuDaily.objects.bulk_create(
+                [
+                    SalesMenuDaily(**dict(zip(("date", "floor", "menu_item_id") + MENU_VALUES, key + tuple(exp_menu.get(key, zero_m)))))
+                    for key in bad_menu
+                ],
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["date", "floor", "menu_item"],
+                update_fields=list(MENU_VALUES),
+            )
+        self.stdout.write(self.style.SUCCESS(f"수정: 시간별 {len(bad_hourly)}건, 메뉴별 {len(bad_menu)}건"))
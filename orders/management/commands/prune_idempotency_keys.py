@@ -0,0 +1,33 @@
+from __future__ import annotations
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from orders.models import IdempotencyKey
+from orders.services.idempotency import idempotency_ttl
+
+
+class Command(BaseCommand):
+    help = "보관 시간(ORDERS_IDEMPOTENCY_TTL_HOURS)이 지난 Idempotency-Key 기록을 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--dry-run", action="store_true", help="삭제 대상 수만 출력합니다.")
+
+    def handle(self, *args, batch_size: int, dry_run: bool, **options):
+        if batch_size < 1:
+            raise CommandError("--batch-size는 1 이상이어야 합니다.")
+
+        cutoff = timezone.now() - idempotency_ttl()
+        qs = IdempotencyKey.objects.filter(created_at__lt=cutoff)
+        if dry_run:
+            self.stdout.write(f"삭제 대상: {qs.count()}건 (기준 {timezone.localtime(cutoff):%Y-%m-%d %H:%M})")
+            return
+
+        deleted = 0
+        while True:
+            ids = list(qs.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            count, _ = IdempotencyKey.objects.filter(id__in=ids).delete()
+            deleted += count
+        self.stdout.write(self.style.SUCCESS(f"{deleted}건 삭제"))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from orders.models import OrderChange
+
+
+class Command(BaseCommand):
+    help = "오래된 주문 변경 로그(OrderChange)를 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-hours", type=float, default=6.0,
+            help="최근 N시간의 변경 로그는 보존합니다(기본 6).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="한 번에 삭제할 행 수(잠금 시간을 짧게 유지).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="삭제 대상 수만 출력합니다.")
+
+    def handle(self, *args, keep_hours: float, batch_size: int, dry_run: bool, **options):
+        if keep_hours < 0 or batch_size < 1:
+            raise CommandError("--keep-hours는 0 이상, --batch-size는 1 이상이어야 합니다.")
+
+        cutoff = timezone.now() - timedelta(hours=keep_hours)
+        qs = OrderChange.objects.filter(created_at__lt=cutoff)
+        if dry_run:
+            self.stdout.write(f"삭제 대상: {qs.count()}건 (기준 {timezone.localtime(cutoff):%Y-%m-%d %H:%M})")
+            return
+
+        # seq 순으로 잘라서 지워 짧은 트랜잭션을 반복한다.
+        deleted = 0
+        while True:
+            seqs = list(qs.order_by("seq").values_list("seq", flat=True)[:batch_size])
+            if not seqs:
+                break
+            count, _ = OrderChange.objects.filter(seq__in=seqs).delete()
+            deleted += count
+        self.stdout.write(self.style.SUCCESS(f"{deleted}건 삭제"))
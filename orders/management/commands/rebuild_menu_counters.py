@@ -0,0 +1,58 @@
+from __future__ import annotations
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders.models import MenuDayCounter
+from orders.services.menu_counters import NONE, aggregate_menu_counters, stored_menu_counters
+
+
+class Command(BaseCommand):
+    help = "메뉴별 일자 집계(MenuDayCounter)를 주문 품목 기준으로 검증하고 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", dest="day", help="YYYY-MM-DD (생략 시 전체 일자)")
+        parser.add_argument("--check", action="store_true", help="불일치만 보고하고 수정하지 않습니다.")
+
+    def handle(self, *args, day: str | None, check: bool, **options):
+        if day:
+            try:
+                day = datetime.strptime(day, "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--date는 YYYY-MM-DD 형식이어야 합니다.")
+
+        expected = aggregate_menu_counters(day)
+        stored = stored_menu_counters(day)
+        mismatched = sorted(
+            key for key in expected.keys() | stored.keys()
+            if expected.get(key, NONE) != stored.get(key, NONE)
+        )
+
+        if check:
+            for key in mismatched[:20]:
+                self.stdout.write(
+                    f"불일치: {key[0]} {key[1]} menu={key[2]} 저장={stored.get(key, NONE)} 실제={expected.get(key, NONE)}"
+                )
+            if mismatched:
+                raise CommandError(f"메뉴 집계 불일치 {len(mismatched)}건")
+            self.stdout.write(self.style.SUCCESS(f"{len(expected)}행 검증, 불일치 없음"))
+            return
+
+        # 동시에 들어온 증분 갱신과 부딪히지 않도록 틀린 행만 덮어쓴다(없어진 행은 0으로).
+        with transaction.atomic():
+            MenuDayCounter.objects.bulk_create(
+                [
+                    MenuDayCounter(
+                        date=d, floor=floor, menu_item_id=menu_item_id,
+                        pending_qty=values[0], prepared_qty=values[1], sold_qty=values[2],
+                    )
+                    for d, floor, menu_item_id in mismatched
+                    for values in [expected.get((d, floor, menu_item_id), NONE)]
+                ],
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["date", "floor", "menu_item"],
+                update_fields=["pending_qty", "prepared_qty", "sold_qty"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(expected)}행 검증, 불일치 {len(mismatched)}건 수정"))
@@ -0,0 +1,180 @@
+from __future__ import annotations
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import Resolver404, resolve
+
+from orders.models import MenuItem, Table
+
+
+def _load(path: Path) -> list[dict]:
+    entries = []
+    with path.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                raise CommandError(f"{path}:{lineno} JSON 형식 오류: {e}")
+            if "request_id" in entry and "method" not in entry:
+                raise CommandError(f"{path}는 캡처 파일이 아닙니다(요청 목록 형식).")
+            entries.append(entry)
+    entries.sort(key=lambda e: e.get("ts", 0))
+    return entries
+
+
+def _endpoint(path: str) -> str:
+    try:
+        return resolve(path.split("?", 1)[0]).view_name
+    except Resolver404:
+        return "(unresolved)"
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Command(BaseCommand):
+    help = "TrafficCaptureMiddleware 캡처(JSONL)를 새 테스트 DB에 재생하고 엔드포인트별 지연 분위수/오류 수를 보고합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("capture", help="ORDERS_CAPTURE_PATH로 남긴 JSONL 파일")
+        parser.add_argument("--speed", type=float, default=1.0, help="재생 배속(1, 10 ...). 0이면 최대 속도")
+        parser.add_argument("--threads", type=int, default=1, help="동시 실행 스레드 수")
+        parser.add_argument("--fixture", action="append", default=[], help="재생 DB에 먼저 loaddata할 픽스처")
+        parser.add_argument("--limit", type=int, default=0, help="앞에서부터 N건만 재생")
+
+    def handle(self, *args, capture: str, speed: float, threads: int,
+               fixture: list[str], limit: int, **options):
+        path = Path(capture)
+        if not path.is_file():
+            raise CommandError(f"캡처 파일이 없습니다: {path}")
+        entries = _load(path)
+        if limit:
+            entries = entries[:limit]
+        if not entries:
+            raise CommandError("재생할 요청이 없습니다.")
+
+        if connection.vendor == "sqlite" and threads > 1:
+            self.stdout.write("참고: SQLite는 쓰기가 직렬화되므로 잠금 오류(5xx로 집계)가 날 수 있습니다.")
+
+        # 재생 요청이 다시 캡처되지 않게 하고, 테스트 클라이언트 호스트를 허용한다.
+        overrides = override_settings(
+            ORDERS_CAPTURE_PATH="",
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        )
+        with overrides:
+            results, elapsed = self._replay_fresh(entries, speed, threads, fixture)
+        self._report(results, elapsed, speed)
+
+    def _replay_fresh(self, entries, speed, threads, fixtures):
+        """
+        Replay into a new test database, never the live one: a long capture would hold
+        counter/rollup row locks for its whole length, PostgreSQL sequences would burn real
+        order numbers, and ``create_orders`` (sync) refuses to run inside a transaction.
+        """
+        # 캡처의 menu_item_id/table_number가 맞도록 현재 DB의 메뉴·테이블을 id 그대로 옮긴다.
+        catalog = [(model, list(model.objects.all())) for model in (Table, MenuItem)]
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+        try:
+            for model, rows in catalog:
+                model.objects.bulk_create(rows)
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [Table, MenuItem]):
+                    cursor.execute(sql)
+            for name in fixtures:
+                call_command("loaddata", name, verbosity=0)
+            return self._run(entries, speed, threads)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    # ---------- 재생 ----------
+    def _run(self, entries, speed: float, threads: int):
+        local = threading.local()
+        lock = threading.Lock()
+        results: list[tuple[str, float, int]] = []
+
+        def client_for(role: str | None) -> Client:
+            clients = getattr(local, "clients", None)
+            if clients is None:
+                clients = local.clients = {}
+            client = clients.get(role)
+            if client is None:
+                client = clients[role] = Client(raise_request_exception=False)
+                if role:
+                    session = client.session
+                    session["role"] = role
+                    session.save()
+            return client
+
+        def send(entry: dict) -> None:
+            client = client_for(entry.get("role"))
+            headers = {}
+            if entry.get("idempotency_key"):
+                headers["Idempotency-Key"] = entry["idempotency_key"]
+            started = time.perf_counter()
+            try:
+                response = client.generic(
+                    entry["method"], entry["path"], (entry.get("body") or "").encode("utf-8"),
+                    content_type=entry.get("content_type") or "application/octet-stream",
+                    headers=headers,
+                )
+                status = response.status_code
+            except Exception:  # 재생은 계속하고 오류로 센다.
+                status = 599
+            ms = (time.perf_counter() - started) * 1000
+            with lock:
+                results.append((_endpoint(entry["path"]), ms, status))
+
+        first_ts = entries[0].get("ts", 0)
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+            futures = []
+            for entry in entries:
+                if speed > 0:
+                    due = (entry.get("ts", first_ts) - first_ts) / speed
+                    wait = due - (time.perf_counter() - began)
+                    if wait > 0:
+                        time.sleep(wait)
+                if threads > 1:
+                    futures.append(pool.submit(send, entry))
+                else:
+                    send(entry)
+            for future in futures:
+                future.result()
+        return results, time.perf_counter() - began
+
+    def _report(self, results, elapsed: float, speed: float) -> None:
+        by_endpoint: dict[str, list[tuple[float, int]]] = {}
+        for endpoint, ms, status in results:
+            by_endpoint.setdefault(endpoint, []).append((ms, status))
+
+        label = f"{speed:g}x" if speed > 0 else "max"
+        self.stdout.write(
+            f"{len(results)}건 재생 ({label}, {elapsed:.1f}s, {len(results) / elapsed if elapsed else 0:.1f} req/s)"
+        )
+        self.stdout.write(
+            f"{'endpoint':<34} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'4xx':>5} {'5xx':>5}"
+        )
+        for endpoint, rows in sorted(by_endpoint.items(), key=lambda kv: -len(kv[1])):
+            times = sorted(ms for ms, _ in rows)
+            client_errors = sum(1 for _, status in rows if 400 <= status < 500)
+            server_errors = sum(1 for _, status in rows if status >= 500)
+            self.stdout.write(
+                f"{endpoint:<34} {len(rows):>6} {_percentile(times, 0.50):>8.1f} {_percentile(times, 0.95):>8.1f} "
+                f"{_percentile(times, 0.99):>8.1f} {times[-1]:>8.1f} {client_errors:>5} {server_errors:>5}"
+            )
+        self.stdout.write("(ms)")
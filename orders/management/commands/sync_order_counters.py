@@ -0,0 +1,45 @@
+from __future__ import annotations
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from orders.models import Order
+from orders.services.progress import aggregate_counters
+
+COUNTER_FIELDS = ("total_qty", "remaining_qty", "dine_in_lines", "takeout_lines")
+EMPTY = dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+class Command(BaseCommand):
+    help = "주문 진행 카운터(total_qty 등)를 품목 기준으로 검증하고 복구합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="불일치만 보고하고 수정하지 않습니다.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, check: bool, batch_size: int, **options):
+        mismatched: list[Order] = []
+        now = timezone.now()
+        ids = list(Order.objects.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            expected = aggregate_counters(chunk)
+            for order in Order.objects.filter(id__in=chunk).only("id", "updated_at", *COUNTER_FIELDS):
+                want = expected.get(order.id, EMPTY)
+                if any(getattr(order, f) != want[f] for f in COUNTER_FIELDS):
+                    for f in COUNTER_FIELDS:
+                        setattr(order, f, want[f])
+                    order.updated_at = now  # 목록 ETag(max updated_at)가 복구를 반영하도록
+                    mismatched.append(order)
+
+        if check:
+            for order in mismatched[:20]:
+                self.stdout.write(f"불일치: 주문 {order.id}")
+            if mismatched:
+                raise CommandError(f"카운터 불일치 {len(mismatched)}건")
+            self.stdout.write(self.style.SUCCESS(f"{len(ids)}건 검증, 불일치 없음"))
+            return
+
+        with transaction.atomic():
+            Order.objects.bulk_update(mismatched, (*COUNTER_FIELDS, "updated_at"), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{len(ids)}건 검증, {len(mismatched)}건 복구"))
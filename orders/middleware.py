@@ -0,0 +1,117 @@
+from __future__ import annotations
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from orders.services.request_stats import request_stats
+
+
+class _QueryTimer:
+    """``connection.execute_wrapper`` hook that sums query count and time."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestTimingMiddleware:
+    """
+    Time every routed request and report it as a ``Server-Timing`` header.
+
+    Wall time, DB time, query count and response bytes are also recorded per URL name
+    (``orders:orders-collection`` ...) in :func:`orders.services.request_stats.request_stats`
+    and exported as per-worker gauges on ``/orders/metrics``.
+    Streaming responses (the SSE stream) and unrouted requests are not measured; the
+    query wrapper only covers the view call, not a streamed body.
+    Opt-in with ``ORDERS_REQUEST_TIMING=1``; ``bench_request_timing`` measures the cost.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "ORDERS_REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        started = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        if match is None or response.streaming:
+            return response
+        db_ms = timer.seconds * 1000
+        size = len(response.content)
+        response["Server-Timing"] = (
+            f'app;dur={wall_ms:.1f}, db;dur={db_ms:.1f};desc="{timer.count} queries", '
+            f'bytes;desc="{size}"'
+        )
+        request_stats().record(
+            match.view_name or match.url_name or "-",
+            wall_ms=wall_ms, db_ms=db_ms, queries=timer.count, bytes=size,
+        )
+        return response
+
+
+class TrafficCaptureMiddleware:
+    """
+    Append API requests to a JSONL capture for ``replay_traffic`` (opt-in).
+
+    Enabled by ``ORDERS_CAPTURE_PATH``; only paths under ``ORDERS_CAPTURE_PREFIXES``
+    are written. Each line holds ``ts`` (epoch seconds; the replay uses offsets from
+    the first line), method, path with query string, body, session role, content type,
+    the ``Idempotency-Key`` header and the response status. Bodies larger than
+    ``ORDERS_CAPTURE_MAX_BODY`` bytes are dropped (``body_truncated``).
+    """
+
+    def __init__(self, get_response):
+        self.path = getattr(settings, "ORDERS_CAPTURE_PATH", "")
+        if not self.path:
+            raise MiddlewareNotUsed
+        self.prefixes = tuple(getattr(settings, "ORDERS_CAPTURE_PREFIXES", ("/orders/api/",)))
+        self.max_body = int(getattr(settings, "ORDERS_CAPTURE_MAX_BODY", 65536))
+        self._lock = threading.Lock()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(self.prefixes):
+            return self.get_response(request)
+        # 뷰가 스트림을 읽기 전에 본문을 잡아 둔다(request.body는 캐시된다).
+        ts = time.time()
+        body = request.body
+        response = self.get_response(request)
+        if response.streaming:  # SSE 스트림은 재생 대상이 아니다.
+            return response
+        entry = {
+            "ts": round(ts, 6),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "body": body.decode("utf-8", "replace") if len(body) <= self.max_body else "",
+            "role": request.session.get("role") if hasattr(request, "session") else None,
+            "content_type": request.content_type or "",
+            "status": response.status_code,
+        }
+        if len(body) > self.max_body:
+            entry["body_truncated"] = True
+        idem_key = request.headers.get("Idempotency-Key")
+        if idem_key:
+            entry["idempotency_key"] = idem_key
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)  # 한 줄을 한 번에 append(워커 간 줄이 섞이지 않도록)
+        return response
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0021_order_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('item_id', models.BigIntegerField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('ORDER_CREATED', '주문 생성'), ('ORDER_STATUS', '상태 변경'), ('ITEM_PROGRESS', '조리 수량 변경')], max_length=16)),
+                ('status', models.CharField(blank=True, default='', max_length=10)),
+                ('prepared_qty', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('order', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='changes', to='orders.order')),
+            ],
+            options={
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['order', 'seq'], name='orders_orde_order_i_994c5d_idx')],
+            },
+        ),
+    ]
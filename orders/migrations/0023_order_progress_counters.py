@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, Q, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    rows = OrderItem.objects.values("order_id").annotate(
+        total=Sum("qty"),
+        remaining=Sum(F("qty") - F("prepared_qty"), output_field=IntegerField()),
+        takeout=Count("id", filter=Q(service_mode="TAKEOUT")),
+        dine_in=Count("id", filter=~Q(service_mode="TAKEOUT")),
+    ).order_by()
+    for r in rows.iterator():
+        Order.objects.filter(pk=r["order_id"]).update(
+            total_qty=r["total"] or 0,
+            remaining_qty=max(0, r["remaining"] or 0),
+            takeout_lines=r["takeout"],
+            dine_in_lines=r["dine_in"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0022_orderchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='dine_in_lines',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='remaining_qty',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='takeout_lines',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_qty',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, F, IntegerField, Sum, When
+
+
+def backfill_menu_counters(apps, schema_editor):
+    MenuDayCounter = apps.get_model("orders", "MenuDayCounter")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    pending = Case(
+        When(order__status="PREPARING", prepared_qty__lt=F("qty"), then=F("qty") - F("prepared_qty")),
+        default=0,
+        output_field=IntegerField(),
+    )
+    rows = (
+        OrderItem.objects.filter(order__order_date__isnull=False)
+        .exclude(order__status="CANCELLED")
+        .values("order__order_date", "order__floor", "menu_item_id")
+        .annotate(pending=Sum(pending), prepared=Sum("prepared_qty"), sold=Sum("qty"))
+        .order_by()
+    )
+    MenuDayCounter.objects.bulk_create(
+        [
+            MenuDayCounter(
+                date=r["order__order_date"], floor=r["order__floor"], menu_item_id=r["menu_item_id"],
+                pending_qty=r["pending"] or 0, prepared_qty=r["prepared"] or 0, sold_qty=r["sold"] or 0,
+            )
+            for r in rows.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0026_order_client_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuDayCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('floor', models.CharField(max_length=2)),
+                ('pending_qty', models.IntegerField(default=0)),
+                ('prepared_qty', models.IntegerField(default=0)),
+                ('sold_qty', models.IntegerField(default=0)),
+                ('menu_item', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.menuitem')),
+            ],
+            options={
+                'ordering': ['-date', 'floor', 'menu_item'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'floor', 'menu_item'), name='uq_menu_day_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_menu_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, Sum
+from django.db.models.functions import ExtractHour
+
+
+def backfill_sales(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    SalesHourly = apps.get_model("orders", "SalesHourly")
+    SalesMenuDaily = apps.get_model("orders", "SalesMenuDaily")
+    counted = ["PREPARING", "READY"]
+    hourly = (
+        Order.objects.filter(status__in=counted, order_date__isnull=False)
+        .annotate(hour=ExtractHour("created_at"))
+        .values("order_date", "hour", "floor", "payment_method")
+        .annotate(
+            n=Count("id"), revenue=Sum("total_price"),
+            cash=Sum("received_cash_amount"), ticket=Sum("received_ticket_amount"),
+        )
+        .order_by()
+    )
+    SalesHourly.objects.bulk_create(
+        [
+            SalesHourly(
+                date=r["order_date"], hour=r["hour"], floor=r["floor"], payment_method=r["payment_method"],
+                orders=r["n"], revenue=r["revenue"] or 0, cash_amount=r["cash"] or 0, ticket_amount=r["ticket"] or 0,
+            )
+            for r in hourly.iterator()
+        ],
+        batch_size=500,
+    )
+    menu = (
+        OrderItem.objects.filter(order__status__in=counted, order__order_date__isnull=False)
+        .values("order__order_date", "order__floor", "menu_item_id")
+        .annotate(sold=Sum("qty"), total=Sum(F("qty") * F("unit_price"), output_field=IntegerField()))
+        .order_by()
+    )
+    SalesMenuDaily.objects.bulk_create(
+        [
+            SalesMenuDaily(
+                date=r["order__order_date"], floor=r["order__floor"], menu_item_id=r["menu_item_id"],
+                qty=r["sold"] or 0, amount=r["total"] or 0,
+            )
+            for r in menu.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0027_menudaycounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('floor', models.CharField(max_length=2)),
+                ('payment_method', models.CharField(choices=[('CASH', '현금'), ('TICKET', '티켓'), ('CASH_TICKET', '현금+티켓')], max_length=12)),
+                ('orders', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('cash_amount', models.BigIntegerField(default=0)),
+                ('ticket_amount', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date', 'hour', 'floor', 'payment_method'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'hour', 'floor', 'payment_method'), name='uq_sales_hourly')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesMenuDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('floor', models.CharField(max_length=2)),
+                ('qty', models.IntegerField(default=0)),
+                ('amount', models.BigIntegerField(default=0)),
+                ('menu_item', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.menuitem')),
+            ],
+            options={
+                'ordering': ['date', 'floor', 'menu_item'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'floor', 'menu_item'), name='uq_sales_menu_daily')],
+            },
+        ),
+        migrations.RunPython(backfill_sales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0028_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status', 'CANCELLED'), _negated=True), fields=['order_date', 'floor', 'status', 'created_at'], name='ord_active_day_idx'),
+        ),
+    ]
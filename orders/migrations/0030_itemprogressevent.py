@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0029_order_active_day_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemProgressEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('floor', models.CharField(max_length=2)),
+                ('delta', models.IntegerField()),
+                ('prepared_qty', models.PositiveIntegerField()),
+                ('wait_seconds', models.PositiveIntegerField()),
+                ('role', models.CharField(blank=True, default='', max_length=20)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('item', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='progress_events', to='orders.orderitem')),
+                ('menu_item', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.menuitem')),
+                ('order', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.order')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['menu_item', 'created_at'], name='orders_item_menu_it_050eb7_idx')],
+            },
+        ),
+    ]
@@ -2,4 +2,8 @@ from .core import (
     FloorChoices, PaymentMethod, OrderType, OrderStatus, OrderSource,
     Table, MenuItem, Order, OrderItem,
 )
-from .counters import FloorOrderCounter
+from .counters import FloorOrderCounter, MenuDayCounter
+from .changes import ChangeKind, OrderChange
+from .idempotency import IdempotencyKey
+from .sales import SalesHourly, SalesMenuDaily
+from .telemetry import ItemProgressEvent
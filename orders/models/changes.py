@@ -0,0 +1,30 @@
+from __future__ import annotations
+from django.db import models
+
+from .core import Order
+
+
+class ChangeKind(models.TextChoices):
+    ORDER_CREATED = "ORDER_CREATED", "주문 생성"
+    ORDER_STATUS  = "ORDER_STATUS", "상태 변경"
+    ITEM_PROGRESS = "ITEM_PROGRESS", "조리 수량 변경"
+
+
+class OrderChange(models.Model):
+    # 추가 전용 변경 로그(outbox). seq가 단조 증가하는 커서 역할을 한다.
+    seq = models.BigAutoField(primary_key=True)
+    order = models.ForeignKey(
+        Order, on_delete=models.DO_NOTHING, db_constraint=False, related_name="changes",
+    )
+    item_id = models.BigIntegerField(null=True, blank=True)
+    kind = models.CharField(max_length=16, choices=ChangeKind.choices)
+    status = models.CharField(max_length=10, blank=True, default="")
+    prepared_qty = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["seq"]
+        indexes = [models.Index(fields=["order", "seq"])]
+
+    def __str__(self):
+        return f"#{self.seq} {self.kind} order={self.order_id}"
@@ -97,8 +97,18 @@ class Order(models.Model):
     total_price = models.PositiveIntegerField(default=0)
     note = models.CharField(max_length=200, blank=True, default="")
 
+    # 진행 카운터: 품목 변경과 같은 트랜잭션에서 갱신(sync_order_counters로 검증/복구)
+    total_qty = models.PositiveIntegerField(default=0)
+    remaining_qty = models.PositiveIntegerField(default=0)
+    dine_in_lines = models.PositiveIntegerField(default=0)
+    takeout_lines = models.PositiveIntegerField(default=0)
+
+    # 오프라인 큐 동기화: 태블릿이 만든 주문 식별자와 단말 기준 주문 시각
+    client_uuid = models.UUIDField(null=True, blank=True, unique=True)
+    client_created_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         constraints = [
@@ -120,6 +130,13 @@ class Order(models.Model):
         indexes = [
             models.Index(fields=["floor", "order_type", "-created_at"]),
             models.Index(fields=["status", "-created_at"]),
+            # 오늘 진행 중 주문(핫셋) 부분 인덱스. SQLite는 조건을 추론하지 못하므로
+            # 이 인덱스를 타야 하는 조회는 .exclude(status=CANCELLED)를 명시한다.
+            models.Index(
+                fields=["order_date", "floor", "status", "created_at"],
+                condition=~Q(status=OrderStatus.CANCELLED),
+                name="ord_active_day_idx",
+            ),
         ]
         ordering = ["-created_at", "-id"]
 
@@ -14,3 +14,25 @@ class FloorOrderCounter(models.Model):
 
     def __str__(self):
         return f"{self.date} {self.floor} last={self.last_no}"
+
+
+class MenuDayCounter(models.Model):
+    # 일자·층·메뉴별 집계(주문/상태/조리 수량 변경과 같은 트랜잭션에서 증분 갱신)
+    # rebuild_menu_counters 명령으로 OrderItem 기준 재계산 가능
+    date = models.DateField()
+    floor = models.CharField(max_length=2)
+    menu_item = models.ForeignKey(
+        "orders.MenuItem", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    pending_qty = models.IntegerField(default=0)   # 조리중 주문의 남은 수량
+    prepared_qty = models.IntegerField(default=0)  # 취소 제외 조리 완료 수량
+    sold_qty = models.IntegerField(default=0)      # 취소 제외 주문 수량
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "floor", "menu_item"], name="uq_menu_day_counter"),
+        ]
+        ordering = ["-date", "floor", "menu_item"]
+
+    def __str__(self):
+        return f"{self.date} {self.floor} menu={self.menu_item_id} pending={self.pending_qty}"
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from django.db import models
+
+from .core import Order
+
+
+class IdempotencyKey(models.Model):
+    # 주문 POST 재전송 대비: 같은 Idempotency-Key로 다시 오면 저장된 201 응답을 돌려준다.
+    key = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64)
+    order = models.ForeignKey(
+        Order, on_delete=models.SET_NULL, null=True, blank=True, related_name="+",
+    )
+    status_code = models.PositiveSmallIntegerField(default=201)
+    response_body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.key} → order={self.order_id}"
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from django.db import models
+
+from .core import PaymentMethod
+
+
+class SalesHourly(models.Model):
+    # 일자·시간·층·결제수단별 주문 매출 집계(취소 제외). 주문 생성/취소 트랜잭션에서 증분 갱신
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()  # 현지 시각 0~23
+    floor = models.CharField(max_length=2)
+    payment_method = models.CharField(max_length=12, choices=PaymentMethod.choices)
+    orders = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    cash_amount = models.BigIntegerField(default=0)
+    ticket_amount = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "hour", "floor", "payment_method"], name="uq_sales_hourly",
+            ),
+        ]
+        ordering = ["date", "hour", "floor", "payment_method"]
+
+    def __str__(self):
+        return f"{self.date} {self.hour:02d}시 {self.floor} {self.payment_method} {self.revenue:,}원"
+
+
+class SalesMenuDaily(models.Model):
+    # 일자·층·메뉴별 판매 수량/금액 집계(취소 제외)
+    date = models.DateField()
+    floor = models.CharField(max_length=2)
+    menu_item = models.ForeignKey(
+        "orders.MenuItem", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    qty = models.IntegerField(default=0)
+    amount = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "floor", "menu_item"], name="uq_sales_menu_daily"),
+        ]
+        ordering = ["date", "floor", "menu_item"]
+
+    def __str__(self):
+        return f"{self.date} {self.floor} menu={self.menu_item_id} x{self.qty}"
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from django.db import models
+from django.utils import timezone
+
+
+class ItemProgressEvent(models.Model):
+    # 조리 수량 변경 이벤트(추가 전용). OrderChange와 달리 정리하지 않고 조리 시간 분석에 쓴다.
+    order = models.ForeignKey(
+        "orders.Order", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    item = models.ForeignKey(
+        "orders.OrderItem", on_delete=models.DO_NOTHING, db_constraint=False, related_name="progress_events",
+    )
+    menu_item = models.ForeignKey(
+        "orders.MenuItem", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    floor = models.CharField(max_length=2)
+    delta = models.IntegerField()                      # 음수면 완료 취소
+    prepared_qty = models.PositiveIntegerField()       # 변경 후 값
+    wait_seconds = models.PositiveIntegerField()       # 주문 생성부터 이 변경까지
+    role = models.CharField(max_length=20, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["menu_item", "created_at"])]
+
+    def __str__(self):
+        return f"item={self.item_id} {self.delta:+d} ({self.wait_seconds}s)"
@@ -1,2 +1,5 @@
 from .totals import recalc_totals
-from .numbering import allocate_floor_order_no
\ No newline at end of file
+from .numbering import allocate_floor_order_no
+from .realtime import notify_orders_changed
+from .changes import record_order_change, record_changes
+from .ordering import create_order, create_orders
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import time
+from typing import Callable
+
+from django.core.cache import caches
+from django.db import transaction
+
+from .metrics import record_catalog_cache
+
+CATALOG_CACHE = "catalog"
+VERSION_KEY = "catalog:version"
+BODY_TIMEOUT = 60 * 60 * 24
+
+
+def _cache():
+    return caches[CATALOG_CACHE]
+
+
+def _now_version() -> int:
+    # 캐시가 비워져도 버전이 과거 값으로 되돌아가지 않도록 시각 기반으로 시작한다.
+    return int(time.time() * 1000)
+
+
+def catalog_version() -> int:
+    """Current catalog version, shared by all worker processes through the catalog cache."""
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _now_version(), timeout=None)
+        version = cache.get(VERSION_KEY) or _now_version()
+    return int(version)
+
+
+def bump_catalog_version() -> None:
+    """Invalidate every cached catalog body once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def _bump() -> None:
+    cache = _cache()
+    current = cache.get(VERSION_KEY) or 0
+    cache.set(VERSION_KEY, max(int(current) + 1, _now_version()), timeout=None)
+
+
+def cached_catalog_body(name: str, version: int, build: Callable[[], bytes]) -> bytes:
+    """Return the encoded body for ``name`` at ``version``, building it on a miss."""
+    cache = _cache()
+    key = f"catalog:{version}:{name}"
+    body = cache.get(key)
+    record_catalog_cache(name, body is not None)
+    if body is None:
+        body = build()
+        cache.set(key, body, timeout=BODY_TIMEOUT)
+    return body
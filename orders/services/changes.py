@@ -0,0 +1,99 @@
+from __future__ import annotations
+from datetime import timedelta
+from typing import Iterable
+
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from orders.models import ChangeKind, Order, OrderChange, OrderItem
+from .realtime import notify_orders_changed
+
+# 커밋 순서와 seq 순서는 어긋날 수 있다(PostgreSQL: 먼저 seq를 받은 트랜잭션이 나중에 커밋).
+# 그래서 커서는 빈 번호 없이 이어진 마지막 seq까지만 올리고, 빈 번호 뒤의 행은 다음 조회에서 다시 읽는다.
+# 빈 번호 바로 뒤 행이 이 시간보다 오래됐으면 그 번호는 롤백(또는 시퀀스 캐시)으로 비었다고 보고 넘어간다.
+CURSOR_GAP_WAIT = timedelta(seconds=60)
+
+
+def record_order_change(order: Order, kind: str, item: OrderItem | None = None) -> None:
+    """
+    Append one change row for ``order`` (and optionally ``item``).
+
+    Call it inside the transaction that makes the change so the row commits with it.
+    """
+    record_changes([_change_row(order, kind, item)])
+
+
+def record_changes(rows: Iterable[OrderChange]) -> None:
+    rows = list(rows)
+    if not rows:
+        return
+    OrderChange.objects.bulk_create(rows, batch_size=len(rows))
+    notify_orders_changed()
+
+
+def _change_row(order: Order, kind: str, item: OrderItem | None = None) -> OrderChange:
+    return OrderChange(
+        order_id=order.pk,
+        item_id=item.pk if item is not None else None,
+        kind=kind,
+        status=order.status,
+        prepared_qty=item.prepared_qty if item is not None else None,
+    )
+
+
+def order_change(order: Order, kind: str) -> OrderChange:
+    return _change_row(order, kind)
+
+
+def item_change(order: Order, item: OrderItem) -> OrderChange:
+    return _change_row(order, ChangeKind.ITEM_PROGRESS, item)
+
+
+def encode_cursor(seq: int | None) -> str:
+    return str(int(seq or 0))
+
+
+def decode_cursor(raw: str | None) -> int | None:
+    if raw is None or raw == "":
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+def latest_seq() -> int:
+    return OrderChange.objects.aggregate(latest=Max("seq"))["latest"] or 0
+
+
+def cursor_is_stale(cursor: int) -> bool:
+    """True when rows after ``cursor`` were pruned, or the cursor is from elsewhere."""
+    agg = OrderChange.objects.aggregate(first=Min("seq"), latest=Max("seq"))
+    if agg["latest"] is None:
+        return cursor > 0
+    return cursor > agg["latest"] or cursor < agg["first"] - 1
+
+
+def changes_since(cursor: int, limit: int) -> tuple[list[tuple[int, int]], int]:
+    """
+    ``(seq, order_id)`` pairs after ``cursor`` in seq order, and the next cursor.
+
+    The next cursor stops before the first missing seq that may still belong to an
+    uncommitted transaction, so rows after it are returned again until the gap fills or
+    the row after it is older than ``CURSOR_GAP_WAIT``. Known limitation: a transaction
+    that commits more than ``CURSOR_GAP_WAIT`` after a later seq was written is skipped
+    (``created_at`` is the insert time, not the commit time).
+    """
+    rows = list(
+        OrderChange.objects.filter(seq__gt=cursor)
+        .order_by("seq")
+        .values_list("seq", "order_id", "created_at")[:limit]
+    )
+    settled = timezone.now() - CURSOR_GAP_WAIT
+    next_cursor = cursor
+    for seq, _, created_at in rows:
+        if seq != next_cursor + 1 and created_at > settled:
+            break
+        next_cursor = seq
+    return [(seq, order_id) for seq, order_id, _ in rows], next_cursor
@@ -0,0 +1,66 @@
+from __future__ import annotations
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+
+from orders.models import IdempotencyKey, Order
+
+MAX_KEY_LENGTH = 64
+
+
+def idempotency_ttl() -> timedelta:
+    return timedelta(hours=float(getattr(settings, "ORDERS_IDEMPOTENCY_TTL_HOURS", 24)))
+
+
+def request_fingerprint(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def find_idempotent_response(key: str) -> IdempotencyKey | None:
+    """
+    The stored response for ``key``, or None.
+
+    An expired row is deleted here so the key can be claimed again by the next INSERT.
+    """
+    row = IdempotencyKey.objects.filter(key=key).first()
+    if row is None:
+        return None
+    if row.created_at < timezone.now() - idempotency_ttl():
+        IdempotencyKey.objects.filter(pk=row.pk).delete()
+        return None
+    return row
+
+
+def remember_response(key: str, fingerprint: str, order: Order, body: bytes, status: int = 201) -> None:
+    """
+    Store the response for ``key``; call it inside the transaction that created ``order``.
+
+    A concurrent request with the same key fails this INSERT on the unique constraint
+    (its order rolls back) and replays the winner's row instead.
+    """
+    IdempotencyKey.objects.create(
+        key=key,
+        request_hash=fingerprint,
+        order=order,
+        status_code=status,
+        response_body=body.decode("utf-8"),
+    )
+
+
+def _violation(exc: IntegrityError) -> str:
+    # PostgreSQL은 제약 이름, SQLite는 "UNIQUE constraint failed: table.column" 메시지로 구분한다.
+    constraint = getattr(getattr(exc.__cause__, "diag", None), "constraint_name", None)
+    return (constraint or str(exc)).lower()
+
+
+def is_key_conflict(exc: IntegrityError) -> bool:
+    """True when ``exc`` is a duplicate ``IdempotencyKey.key``."""
+    return "idempotencykey" in _violation(exc)
+
+
+def is_client_uuid_conflict(exc: IntegrityError) -> bool:
+    """True when ``exc`` is a duplicate ``Order.client_uuid`` (the same tablet order sent twice)."""
+    return "client_uuid" in _violation(exc)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import Iterable, Sequence
+
+from django.db import connection
+from django.db.models import DateField, Model
+
+
+def add_to_rows(
+    model: type[Model],
+    key_fields: Sequence[str],
+    value_fields: Sequence[str],
+    rows: Iterable[tuple[tuple, Sequence[int]]],
+) -> None:
+    """
+    Add ``(key, deltas)`` rows to ``model`` counters with one INSERT ... ON CONFLICT DO UPDATE.
+
+    The conflict target must match a unique constraint on ``key_fields``. The syntax
+    is shared by PostgreSQL and SQLite (3.24+). Rows are written in key order so
+    concurrent transactions take row locks in the same order.
+    """
+    rows = sorted((tuple(key), list(deltas)) for key, deltas in rows if any(deltas))
+    if not rows:
+        return
+    meta = model._meta
+    qn = connection.ops.quote_name
+    table = qn(meta.db_table)
+    key_cols = [qn(meta.get_field(name).column) for name in key_fields]
+    value_cols = [qn(meta.get_field(name).column) for name in value_fields]
+    date_slots = [i for i, name in enumerate(key_fields) if isinstance(meta.get_field(name), DateField)]
+
+    width = len(key_cols) + len(value_cols)
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * width) + ")"] * len(rows))
+    updates = ", ".join(f"{c} = {table}.{c} + excluded.{c}" for c in value_cols)
+    sql = (
+        f"INSERT INTO {table} ({', '.join(key_cols + value_cols)}) VALUES {placeholders} "
+        f"ON CONFLICT ({', '.join(key_cols)}) DO UPDATE SET {updates}"
+    )
+    params = []
+    for key, deltas in rows:
+        key = list(key)
+        for i in date_slots:
+            key[i] = connection.ops.adapt_datefield_value(key[i])
+        params += key + deltas
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from datetime import date
+from typing import Dict, Iterable, Tuple
+
+from django.db.models import Case, F, IntegerField, Sum, When
+
+from orders.models import MenuDayCounter, Order, OrderItem, OrderStatus
+from .increments import add_to_rows
+
+Key = Tuple[date, str, int]
+Contribution = Tuple[int, int, int]  # (pending, prepared, sold)
+NONE: Contribution = (0, 0, 0)
+
+
+def contribution(status: str, qty: int, prepared_qty: int) -> Contribution:
+    """What one order line adds to its menu counter row under ``status``."""
+    if status == OrderStatus.CANCELLED:
+        return NONE
+    pending = max(0, qty - prepared_qty) if status == OrderStatus.PREPARING else 0
+    return pending, prepared_qty, qty
+
+
+class MenuCounterDeltas:
+    """
+    Collects counter changes for one transaction and writes them with a single upsert.
+
+    Orders without ``order_date`` are not counted (the rebuild skips them as well).
+    """
+
+    def __init__(self):
+        self._rows: Dict[Key, list[int]] = {}
+
+    def add(self, order: Order, menu_item_id: int, before: Contribution, after: Contribution) -> None:
+        if order.order_date is None or before == after:
+            return
+        row = self._rows.setdefault((order.order_date, order.floor, menu_item_id), [0, 0, 0])
+        for i in range(3):
+            row[i] += after[i] - before[i]
+
+    def add_lines(self, order: Order, old_status: str, lines: Iterable[tuple[int, int, int, int]]) -> None:
+        """``lines`` are ``(menu_item_id, qty, old_prepared, new_prepared)``; ``order`` holds the new status."""
+        for menu_item_id, qty, old_prepared, new_prepared in lines:
+            self.add(
+                order, menu_item_id,
+                contribution(old_status, qty, old_prepared),
+                contribution(order.status, qty, new_prepared),
+            )
+
+    def apply(self) -> None:
+        rows, self._rows = self._rows, {}
+        add_to_rows(
+            MenuDayCounter, ("date", "floor", "menu_item"),
+            ("pending_qty", "prepared_qty", "sold_qty"), rows.items(),
+        )
+
+
+def count_created(entries: Iterable[tuple[Order, Iterable[OrderItem]]]) -> None:
+    """Add newly inserted orders' lines to the counters."""
+    deltas = MenuCounterDeltas()
+    for order, items in entries:
+        for item in items:
+            deltas.add(order, item.menu_item_id, NONE, contribution(order.status, item.qty, item.prepared_qty))
+    deltas.apply()
+
+
+def order_lines(order_ids) -> Dict[int, list[tuple[int, int, int, int]]]:
+    """``order_id -> [(item_id, menu_item_id, qty, prepared_qty), ...]`` in one query."""
+    lines: Dict[int, list[tuple[int, int, int, int]]] = {}
+    rows = OrderItem.objects.filter(order_id__in=order_ids).values_list(
+        "order_id", "id", "menu_item_id", "qty", "prepared_qty",
+    )
+    for order_id, *line in rows:
+        lines.setdefault(order_id, []).append(tuple(line))
+    return lines
+
+
+def status_change_lines(lines, old_prepared: Dict[int, int]) -> list[tuple[int, int, int, int]]:
+    """Turn :func:`order_lines` rows into ``add_lines`` input; ``old_prepared`` maps changed items."""
+    return [
+        (menu_item_id, qty, old_prepared.get(item_id, prepared), prepared)
+        for item_id, menu_item_id, qty, prepared in lines
+    ]
+
+
+def aggregate_menu_counters(day: date | None = None) -> Dict[Key, Contribution]:
+    """Recompute the counter rows from ``OrderItem`` (all days, or one ``day``)."""
+    qs = OrderItem.objects.filter(order__order_date__isnull=False).exclude(order__status=OrderStatus.CANCELLED)
+    if day is not None:
+        qs = qs.filter(order__order_date=day)
+    pending = Case(
+        When(order__status=OrderStatus.PREPARING, prepared_qty__lt=F("qty"), then=F("qty") - F("prepared_qty")),
+        default=0,
+        output_field=IntegerField(),
+    )
+    rows = qs.values("order__order_date", "order__floor", "menu_item_id").annotate(
+        pending=Sum(pending),
+        prepared=Sum("prepared_qty"),
+        sold=Sum("qty"),
+    ).order_by()
+    return {
+        (r["order__order_date"], r["order__floor"], r["menu_item_id"]): (
+            r["pending"] or 0, r["prepared"] or 0, r["sold"] or 0,
+        )
+        for r in rows
+    }
+
+
+def stored_menu_counters(day: date | None = None) -> Dict[Key, Contribution]:
+    qs = MenuDayCounter.objects.all()
+    if day is not None:
+        qs = qs.filter(date=day)
+    return {
+        (r.date, r.floor, r.menu_item_id): (r.pending_qty, r.prepared_qty, r.sold_qty)
+        for r in qs
+        if (r.pending_qty, r.prepared_qty, r.sold_qty) != NONE
+    }
+
@@ -0,0 +1,280 @@
+from __future__ import annotations
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.utils import timezone
+
+from orders.models import Order, OrderStatus
+from orders.services.request_stats import QUANTILES, request_stats
+
+# 주문번호 할당 지연(초) 히스토그램 경계
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRICS: Dict[str, Tuple[str, str]] = {
+    "orders_created_total": ("counter", "생성된 주문 수(커밋 기준, 주문 유형/결제 수단별)"),
+    "order_item_progress_updates_total": ("counter", "조리 진행 수량이 바뀐 품목 수(경로별)"),
+    "order_number_allocation_seconds": ("histogram", "주문번호 할당 지연(방식별)"),
+    "catalog_cache_requests_total": ("counter", "메뉴/테이블 목록 본문 캐시 조회(hit/miss)"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsStore:
+    """
+    Counters and histograms of this process, optionally shared through a directory.
+
+    With ``ORDERS_METRICS_DIR`` set, each process writes its values to its own JSON file
+    (at most once per ``ORDERS_METRICS_FLUSH_SECONDS``, from a background thread) and a
+    scrape sums every file, so any gunicorn worker answers with the totals. Files of
+    exited workers are kept so counters do not go backwards; clear the directory on deploy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._token = f"{self._pid}-{uuid.uuid4().hex[:8]}"
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        self._dirty = False
+        self._flusher: threading.Thread | None = None
+
+    def _check_fork(self) -> None:
+        # fork된 워커는 부모의 값을 물려받지 않고 자기 파일을 새로 쓴다.
+        if self._pid != os.getpid():
+            self._reset()
+
+    def inc(self, name: str, labels: Dict[str, str], amount: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._touch()
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            row = self._histograms.get(key)
+            if row is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                row = self._histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            else:
+                row[len(LATENCY_BUCKETS)] += 1
+            row[-1] += value
+            self._touch()
+
+    def _touch(self) -> None:
+        self._dirty = True
+        if self._flusher is None and _metrics_dir() is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="orders-metrics", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(_flush_seconds())
+            self.flush()
+
+    def _state(self) -> dict:
+        return {
+            "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+            "histograms": [[name, list(labels), row] for (name, labels), row in self._histograms.items()],
+        }
+
+    def flush(self) -> None:
+        directory = _metrics_dir()
+        with self._lock:
+            self._check_fork()
+            if directory is None or not self._dirty:
+                return
+            state = json.dumps(self._state())
+            self._dirty = False
+            path = directory / f"{self._token}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(state, encoding="utf-8")
+        os.replace(tmp, path)  # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 교체한다.
+
+    def collect(self) -> dict:
+        """Totals across every process file (this process's own values are read live)."""
+        with self._lock:
+            self._check_fork()
+            states = [self._state()]
+            own = f"{self._token}.json"
+        directory = _metrics_dir()
+        if directory is not None:
+            for path in directory.glob("*.json"):
+                if path.name == own:
+                    continue
+                try:
+                    states.append(json.loads(path.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    continue  # 교체 중이거나 깨진 파일은 이번 수집에서 건너뛴다.
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        for state in states:
+            for name, labels, value in state.get("counters", []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, row in state.get("histograms", []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                total = histograms.setdefault(key, [0] * len(row))
+                for i, value in enumerate(row):
+                    total[i] += value
+        return {"counters": counters, "histograms": histograms}
+
+
+def _metrics_dir() -> Path | None:
+    raw = getattr(settings, "ORDERS_METRICS_DIR", "")
+    if not raw:
+        return None
+    path = Path(raw)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _flush_seconds() -> float:
+    return float(getattr(settings, "ORDERS_METRICS_FLUSH_SECONDS", 1.0))
+
+
+_store = MetricsStore()
+atexit.register(_store.flush)  # 종료 직전 값까지 파일에 남긴다.
+
+
+def metrics_store() -> MetricsStore:
+    return _store
+
+
+# ---------- 계측 지점 ----------
+def record_orders_created(orders: Iterable[Order]) -> None:
+    """Count ``orders`` once the current transaction commits."""
+    keys = [(o.order_type, o.payment_method) for o in orders]
+
+    def count() -> None:
+        for order_type, payment_method in keys:
+            _store.inc("orders_created_total", {"order_type": order_type, "payment_method": payment_method})
+
+    transaction.on_commit(count)
+
+
+def record_progress_updates(count: int, source: str) -> None:
+    if count:
+        transaction.on_commit(
+            lambda: _store.inc("order_item_progress_updates_total", {"source": source}, count)
+        )
+
+
+def observe_number_allocation(method: str, seconds: float) -> None:
+    _store.observe("order_number_allocation_seconds", {"method": method}, seconds)
+
+
+def record_catalog_cache(name: str, hit: bool) -> None:
+    _store.inc("catalog_cache_requests_total", {"catalog": name, "result": "hit" if hit else "miss"})
+
+
+# ---------- Prometheus 텍스트 형식 ----------
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name: str, labels: Iterable[Tuple[str, str]], value: float) -> str:
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    number = repr(float(value)) if isinstance(value, float) and not float(value).is_integer() else str(int(value))
+    return f"{name}{{{pairs}}} {number}" if pairs else f"{name} {number}"
+
+
+def _backlog_lines() -> List[str]:
+    # 조리 대기(오늘 PREPARING) 현황은 저장하지 않고 수집 시점에 DB에서 읽는다(ord_active_day_idx).
+    rows = (
+        Order.objects.filter(order_date=timezone.localdate(), status=OrderStatus.PREPARING)
+        .exclude(status=OrderStatus.CANCELLED)
+        .values("floor")
+        .annotate(n=Count("id"), remaining=Sum("remaining_qty"), oldest=Min("created_at"))
+        .order_by("floor")
+    )
+    now = timezone.now()
+    gauges = {
+        "orders_preparing_backlog": ("조리 대기 중인 주문 수", "n"),
+        "orders_preparing_remaining_qty": ("조리 대기 중인 남은 수량", "remaining"),
+        "orders_preparing_oldest_seconds": ("가장 오래 기다린 조리 대기 주문의 경과 시간", "oldest"),
+    }
+    rows = list(rows)
+    lines: List[str] = []
+    for name, (help_text, field) in gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for r in rows:
+            value = r[field] or 0
+            if field == "oldest":
+                value = round((now - r["oldest"]).total_seconds(), 3) if r["oldest"] else 0
+            lines.append(_series(name, [("floor", r["floor"])], value))
+    return lines
+
+
+# RequestTimingMiddleware 표본(request_stats) -> 게이지 이름, 설명
+REQUEST_GAUGES: Dict[str, Tuple[str, str]] = {
+    "wall_ms": ("orders_request_wall_milliseconds", "요청 처리 시간 분위수(ms, 엔드포인트별, 최근 창)"),
+    "db_ms": ("orders_request_db_milliseconds", "요청당 DB 시간 분위수(ms, 엔드포인트별, 최근 창)"),
+    "queries": ("orders_request_queries", "요청당 쿼리 수 분위수(엔드포인트별, 최근 창)"),
+    "bytes": ("orders_request_response_bytes", "응답 본문 크기 분위수(바이트, 엔드포인트별, 최근 창)"),
+}
+
+
+def _request_timing_lines() -> List[str]:
+    # 요청 분포는 워커마다 최근 1~2 창(ORDERS_TIMING_WINDOW_SECONDS)만 들고 있다.
+    # 창이 넘어가면 값이 줄어들므로 counter/summary가 아닌 게이지로, 응답한 워커의 값만 worker 라벨을 붙여 내보낸다.
+    snapshot = request_stats().snapshot()
+    worker = str(os.getpid())
+    name = "orders_request_window_count"
+    lines = [f"# HELP {name} 최근 창에 기록된 요청 수(엔드포인트별)", f"# TYPE {name} gauge"]
+    for endpoint, stats in snapshot.items():
+        lines.append(_series(name, (("endpoint", endpoint), ("worker", worker)), stats["wall_ms"]["count"]))
+    for metric, (name, help_text) in REQUEST_GAUGES.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for endpoint, stats in snapshot.items():
+            labels = (("endpoint", endpoint), ("worker", worker))
+            for label, q in QUANTILES:
+                lines.append(_series(name, labels + (("quantile", repr(q)),), float(stats[metric][label])))
+    return lines
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    data = _store.collect()
+    lines: List[str] = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "counter":
+            for (metric, labels), value in sorted(data["counters"].items()):
+                if metric == name:
+                    lines.append(_series(name, labels, value))
+            continue
+        for (metric, labels), row in sorted(data["histograms"].items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, row):
+                cumulative += count
+                lines.append(_series(f"{name}_bucket", labels + (("le", repr(bound)),), cumulative))
+            cumulative += row[len(LATENCY_BUCKETS)]
+            lines.append(_series(f"{name}_bucket", labels + (("le", "+Inf"),), cumulative))
+            lines.append(_series(f"{name}_sum", labels, float(row[-1])))
+            lines.append(_series(f"{name}_count", labels, cumulative))
+    lines += _request_timing_lines()
+    lines += _backlog_lines()
+    return "\n".join(lines) + "\n"
@@ -1,9 +1,16 @@
 from __future__ import annotations
+import os
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
 from django.db import connection, transaction, IntegrityError
 from django.db.models import F
 from django.utils import timezone
 
 from orders.models import FloorOrderCounter, Order, FloorChoices
+from .metrics import observe_number_allocation
 
 
 def allocate_floor_order_no(order: Order, max_retries: int = 3) -> None:
@@ -13,10 +20,14 @@ def allocate_floor_order_no(order: Order, max_retries: int = 3) -> None:
     * PostgreSQL: uses dedicated SEQUENCE per floor to avoid row-level lock contention.
     * Others (e.g. SQLite): falls back to legacy FloorOrderCounter logic.
     """
+    started = time.perf_counter()
     if connection.vendor == "postgresql":
         _allocate_via_sequence(order)
+        method = "sequence"
     else:
         _allocate_via_counter(order, max_retries=max_retries)
+        method = "counter"
+    observe_number_allocation(method, time.perf_counter() - started)
 
 
 def _sequence_name(floor: str | None) -> str:
@@ -34,8 +45,7 @@ def _allocate_via_sequence(order: Order) -> None:
         try:
             Order.objects.filter(pk=order.pk).update(order_no=next_no, order_date=today)
         except IntegrityError as exc:
-            message = exc.__cause__.diag.constraint_name if getattr(exc.__cause__, "diag", None) else str(exc)
-            if message and "uq_floor_date_no" in message:
+            if is_number_conflict(exc):
                 continue
             raise
         order.order_no = next_no
@@ -43,6 +53,12 @@ def _allocate_via_sequence(order: Order) -> None:
         break
 
 
+def is_number_conflict(exc: IntegrityError) -> bool:
+    """True when ``exc`` is a ``uq_floor_date_no`` violation."""
+    message = exc.__cause__.diag.constraint_name if getattr(exc.__cause__, "diag", None) else str(exc)
+    return bool(message and "uq_floor_date_no" in message)
+
+
 def _allocate_via_counter(order: Order, *, max_retries: int) -> None:
     today = timezone.localdate()
     for attempt in range(max_retries):
@@ -61,3 +77,135 @@ def _allocate_via_counter(order: Order, *, max_retries: int) -> None:
         except IntegrityError:
             if attempt == max_retries - 1:
                 raise
+
+
+def take_order_numbers(floor: str, count: int = 1) -> tuple[date, list[int]]:
+    """
+    ``count`` consecutive numbers for new orders on ``floor`` today, in one statement.
+
+    Call it inside the order transaction, before the INSERT.
+
+    * PostgreSQL: ``nextval`` from the floor SEQUENCE. Sequences never roll back, so a
+      failed order leaves a gap, as the per-order sequence path always did.
+    * Others: one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` on the day's
+      FloorOrderCounter. The increment rolls back with a failed order, so no number is lost.
+    """
+    today = timezone.localdate()
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)", [_sequence_name(floor), count],
+            )
+            numbers = sorted(row[0] for row in cursor.fetchall())
+            method = "sequence"
+        else:
+            meta = FloorOrderCounter._meta
+            qn = connection.ops.quote_name
+            table = qn(meta.db_table)
+            date_col, floor_col, last_col = (qn(meta.get_field(f).column) for f in ("date", "floor", "last_no"))
+            cursor.execute(
+                f"INSERT INTO {table} ({date_col}, {floor_col}, {last_col}) VALUES (%s, %s, %s) "
+                f"ON CONFLICT ({date_col}, {floor_col}) "
+                f"DO UPDATE SET {last_col} = {table}.{last_col} + excluded.{last_col} RETURNING {last_col}",
+                [connection.ops.adapt_datefield_value(today), floor, count],
+            )
+            last = cursor.fetchone()[0]
+            numbers = list(range(last - count + 1, last + 1))
+            method = "counter"
+    observe_number_allocation(method, time.perf_counter() - started)
+    return today, numbers
+
+
+# ---------- 블록 선할당(옵트인) ----------
+def reserve_number_block(floor: str, size: int, today: date | None = None) -> list[int]:
+    """
+    Reserve ``size`` order numbers for ``floor`` on ``today`` in one short transaction.
+
+    * PostgreSQL: one ``nextval`` batch from the floor SEQUENCE (shared with the
+      per-order path, so both can run side by side).
+    * Others: one ``UPDATE last_no = last_no + size`` on the day's FloorOrderCounter.
+
+    Must run outside the caller's transaction: if the reservation rolled back with a
+    failed order, another process could be handed the same numbers.
+    """
+    if connection.in_atomic_block:
+        raise RuntimeError("reserve_number_block must be called outside a transaction")
+    today = today or timezone.localdate()
+    started = time.perf_counter()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [_sequence_name(floor), size],
+            )
+            numbers = sorted(row[0] for row in cursor.fetchall())
+    else:
+        with transaction.atomic():
+            fc, _ = FloorOrderCounter.objects.get_or_create(
+                date=today, floor=floor, defaults={"last_no": 0}
+            )
+            FloorOrderCounter.objects.filter(pk=fc.pk).update(last_no=F("last_no") + size)
+            fc.refresh_from_db(fields=["last_no"])
+        numbers = list(range(fc.last_no - size + 1, fc.last_no + 1))
+    observe_number_allocation("block" if size > 1 else "reserve", time.perf_counter() - started)
+    return numbers
+
+
+class BlockAllocator:
+    """
+    Hands out order numbers from blocks this process reserved ahead of time.
+
+    Most orders get their number without touching the database and can be inserted
+    with ``order_no`` already set. Blocks are kept per floor and date; leftovers are
+    dropped when the local date changes (the gaps are harmless), and after a fork.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = max(1, int(block_size))
+        self._lock = threading.Lock()
+        self._pools: dict[str, tuple[date, list[int]]] = {}
+        self._pid = os.getpid()
+
+    def take(self, floor: str, count: int = 1, today: date | None = None) -> tuple[date, list[int]]:
+        today = today or timezone.localdate()
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pools.clear()
+                self._pid = os.getpid()
+            pool_date, numbers = self._pools.get(floor, (today, []))
+            if pool_date != today:
+                numbers = []
+            if len(numbers) < count:
+                size = max(self.block_size, count - len(numbers))
+                numbers = numbers + reserve_number_block(floor, size, today)
+            taken, rest = numbers[:count], numbers[count:]
+            self._pools[floor] = (today, rest)
+        return today, taken
+
+
+_allocator: BlockAllocator | None = None
+_allocator_lock = threading.Lock()
+
+
+def _block_allocator() -> BlockAllocator | None:
+    global _allocator
+    size = int(getattr(settings, "ORDERS_NUMBER_BLOCK_SIZE", 0) or 0)
+    if size <= 1:
+        return None
+    with _allocator_lock:
+        if _allocator is None or _allocator.block_size != size:
+            _allocator = BlockAllocator(size)
+        return _allocator
+
+
+def preallocate_order_numbers(floor: str, count: int = 1) -> tuple[date, list[int]] | None:
+    """
+    Numbers to assign before INSERT when block allocation is enabled
+    (``ORDERS_NUMBER_BLOCK_SIZE`` > 1); None means use ``take_order_numbers``.
+    Call it before opening the order transaction.
+    """
+    allocator = _block_allocator()
+    if allocator is None:
+        return None
+    return allocator.take(floor, count)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import base64
+import binascii
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from orders.models import OrderItem, PaymentMethod
+
+ORDER_FIELDS = (
+    "id", "floor", "order_type", "status", "order_no", "order_date",
+    "table_id", "table__number", "table__name", "is_takeout",
+    "payment_method", "received_amount", "received_cash_amount", "received_ticket_amount",
+    "total_price", "note", "created_at",
+)
+ITEM_FIELDS = (
+    "id", "order_id", "menu_item_id", "menu_item__name",
+    "qty", "unit_price", "service_mode", "prepared_qty",
+)
+
+
+def serialize_order_rows(qs: QuerySet) -> List[Dict[str, Any]]:
+    """
+    Serialize orders from flat ``values()`` rows, without building model instances.
+
+    Produces exactly the same structure (and key order) as the model-based
+    ``_serialize_order`` in two queries: one for orders, one for all their items.
+    ``qs`` keeps its own filtering, ordering and slicing.
+    """
+    rows = list(qs.values(*ORDER_FIELDS))
+    if not rows:
+        return []
+    items_by_order: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    item_rows = (
+        OrderItem.objects.filter(order_id__in=[r["id"] for r in rows])
+        .order_by("id")
+        .values_list(*ITEM_FIELDS)
+    )
+    for item_id, order_id, menu_item_id, name, qty, unit_price, mode, prepared in item_rows:
+        prepared = prepared or 0
+        remaining = max(0, qty - prepared)
+        items_by_order[order_id].append({
+            "id": item_id,
+            "menu_item": {"id": menu_item_id, "name": name, "price": unit_price},
+            "menu_item_name": name,
+            "qty": qty,
+            "unit_price": unit_price,
+            "line_total": qty * (unit_price or 0),
+            "service_mode": mode,
+            "prepared_qty": prepared,
+            "remaining_qty": remaining,
+            "is_prepared": remaining == 0,
+        })
+    return [_order_dict(r, items_by_order[r["id"]]) for r in rows]
+
+
+def _order_dict(r: Dict[str, Any], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    payment_method = r["payment_method"]
+    cash_amount = r["received_cash_amount"]
+    ticket_amount = r["received_ticket_amount"]
+    if cash_amount is None:
+        cash_amount = r["received_amount"] if payment_method == PaymentMethod.CASH else 0
+    if ticket_amount is None:
+        ticket_amount = r["received_amount"] if payment_method == PaymentMethod.TICKET else 0
+    due_after_ticket = max(0, (r["total_price"] or 0) - (ticket_amount or 0))
+    change_amount = max(0, (cash_amount or 0) - due_after_ticket)
+    table_id = r["table_id"]
+    return {
+        "id": r["id"],
+        "floor": r["floor"],
+        "order_type": r["order_type"],
+        "status": r["status"],
+        "order_no": r["order_no"],
+        "order_date": r["order_date"].isoformat() if r["order_date"] else None,
+        "table": (
+            {"id": table_id, "number": r["table__number"], "name": r["table__name"]}
+            if table_id else None
+        ),
+        "is_takeout": r["is_takeout"],
+        "payment_method": payment_method,
+        "received_amount": r["received_amount"],
+        "received_cash_amount": cash_amount or 0,
+        "received_ticket_amount": ticket_amount or 0,
+        "total_price": r["total_price"],
+        "note": r["note"],
+        "change_amount": change_amount,
+        "created_at": timezone.localtime(r["created_at"]).isoformat(),
+        "items": items,
+    }
+
+
+# ---------- 키셋 페이지 커서 ----------
+def encode_page_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor for the page after serialized order ``row`` in ``(-created_at, -id)`` order."""
+    raw = f"{row['created_at']}|{row['id']}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(raw: str | None) -> tuple[datetime, int] | None:
+    if not raw:
+        return None
+    try:
+        text = base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)).decode("utf-8")
+        stamp, _, pk = text.rpartition("|")
+        created_at = parse_datetime(stamp)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if created_at is None or timezone.is_naive(created_at):
+        return None
+    return created_at, pk
+
+
+def after_page_cursor(qs: QuerySet, position: tuple[datetime, int]) -> QuerySet:
+    """
+    Orders of ``qs`` that come after ``position`` in ``(-created_at, -id)`` order.
+
+    The leading ``created_at <=`` bound lets the planner seek the created_at
+    indexes instead of scanning past the earlier pages.
+    """
+    created_at, pk = position
+    return qs.filter(
+        Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+    )
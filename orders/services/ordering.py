@@ -0,0 +1,148 @@
+from __future__ import annotations
+from typing import Callable, List
+
+from django.db import connection, transaction, IntegrityError
+
+from orders.models import ChangeKind, Order, OrderItem
+from .changes import order_change, record_changes, record_order_change
+from .menu_counters import count_created
+from .metrics import record_orders_created
+from .sales import record_sales
+from .numbering import allocate_floor_order_no, is_number_conflict, preallocate_order_numbers, take_order_numbers
+from .progress import counters_for_items
+
+
+def create_order(
+    order: Order,
+    items: List[OrderItem],
+    max_retries: int = 3,
+    on_created: Callable[[Order], None] | None = None,
+) -> Order:
+    """
+    Insert an unsaved ``order`` with its unsaved ``items`` and return it ready to serialize.
+
+    Totals and progress counters are computed before the INSERT and the response is built
+    from memory, so the transaction is seven statements: the order number, the order, the
+    items (ids via ``RETURNING``), the menu counter and the two sales rollup upserts, and
+    the change row. A number taken from the block allocator saves the first one.
+    ``items`` must carry ``menu_item`` instances. Backends that cannot return
+    bulk-inserted ids use the legacy path.
+
+    ``on_created`` runs inside the transaction once the order is complete.
+    """
+    order.total_price = sum(i.line_total for i in items)
+    for field, value in counters_for_items(items).items():
+        setattr(order, field, value)
+
+    if not connection.features.can_return_rows_from_bulk_insert:
+        return _create_order_legacy(order, items, on_created)
+
+    for attempt in range(max_retries):
+        # 블록 선할당은 트랜잭션 밖에서만 예약할 수 있다(켜져 있을 때만).
+        if order.order_no is None and not connection.in_atomic_block:
+            preallocated = preallocate_order_numbers(order.floor)
+            if preallocated:
+                order.order_date, (order.order_no,) = preallocated
+        try:
+            with transaction.atomic():
+                if order.order_no is None:
+                    # 주문과 같은 트랜잭션에서 받아 INSERT가 실패하면 번호도 되돌린다(SQLite 카운터).
+                    order.order_date, (order.order_no,) = take_order_numbers(order.floor)
+                order.save(force_insert=True)
+                for item in items:
+                    item.order = order
+                OrderItem.objects.bulk_create(items, batch_size=len(items) or 1)
+                _count_created([(order, items)])
+                record_order_change(order, ChangeKind.ORDER_CREATED)
+                order._prefetched_objects_cache = {"items": items}
+                record_orders_created([order])
+                if on_created:
+                    on_created(order)
+        except IntegrityError as exc:
+            # 시퀀스가 기존 번호와 겹치면(수동 재설정 등) 새 번호로 다시 시도한다.
+            if not is_number_conflict(exc) or attempt == max_retries - 1:
+                raise
+            order.pk = None
+            order.order_no = None
+            for item in items:
+                item.pk = None
+            continue
+        break
+    return order
+
+
+def _count_created(entries) -> None:
+    # 메뉴별 조리 집계와 매출 롤업을 주문과 같은 트랜잭션에서 올린다.
+    count_created(entries)
+    record_sales(entries)
+
+
+def create_orders(entries: List[tuple[Order, List[OrderItem]]]) -> List[Order]:
+    """
+    Insert many unsaved ``(order, items)`` pairs in one transaction, numbered in list order.
+
+    Numbers for the whole batch are taken in one statement per floor inside the
+    transaction (or from the block allocator); orders, items and change rows are each
+    written with a single bulk INSERT. Backends without bulk ``RETURNING`` save the
+    orders one by one inside the same transaction.
+    """
+    if not entries:
+        return []
+    if connection.in_atomic_block:
+        raise RuntimeError("create_orders must be called outside a transaction")
+
+    by_floor: dict[str, List[Order]] = {}
+    for order, items in entries:
+        order.total_price = sum(i.line_total for i in items)
+        for field, value in counters_for_items(items).items():
+            setattr(order, field, value)
+        by_floor.setdefault(order.floor, []).append(order)
+    preallocated = {floor: preallocate_order_numbers(floor, len(orders)) for floor, orders in by_floor.items()}
+
+    orders = [order for order, _ in entries]
+    with transaction.atomic():
+        for floor, floor_orders in by_floor.items():
+            order_date, numbers = preallocated[floor] or take_order_numbers(floor, len(floor_orders))
+            for order, number in zip(floor_orders, numbers):
+                order.order_date, order.order_no = order_date, number
+        if connection.features.can_return_rows_from_bulk_insert:
+            Order.objects.bulk_create(orders, batch_size=len(orders))
+        else:
+            for order in orders:
+                order.save(force_insert=True)
+        all_items = []
+        for order, items in entries:
+            for item in items:
+                item.order = order
+            all_items.extend(items)
+            order._prefetched_objects_cache = {"items": items}
+        OrderItem.objects.bulk_create(all_items, batch_size=500)
+        _count_created(entries)
+        record_changes(order_change(order, ChangeKind.ORDER_CREATED) for order in orders)
+        record_orders_created(orders)
+    return orders
+
+
+def _create_order_legacy(
+    order: Order, items: List[OrderItem], on_created: Callable[[Order], None] | None = None,
+) -> Order:
+    with transaction.atomic():
+        order.save(force_insert=True)
+        for item in items:
+            item.order = order
+        OrderItem.objects.bulk_create(items, batch_size=len(items) or 1)
+        if order.order_no is None:
+            allocate_floor_order_no(order)  # 층별 일자 카운터 부여
+        _count_created([(order, items)])
+        record_order_change(order, ChangeKind.ORDER_CREATED)
+
+        created_items = list(
+            OrderItem.objects.select_related("menu_item")
+            .filter(order=order)
+            .order_by("id")
+        )
+        order._prefetched_objects_cache = {"items": created_items}
+        record_orders_created([order])
+        if on_created:
+            on_created(order)
+    return order
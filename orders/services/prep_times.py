@@ -0,0 +1,107 @@
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List
+
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from orders.models import ItemProgressEvent, MenuItem, Order, OrderItem
+
+# 조리 소요 시간 히스토그램 경계(분). 마지막 칸은 60분 초과.
+BUCKET_MINUTES = (1, 2, 3, 5, 7, 10, 15, 20, 30, 45, 60)
+
+
+def progress_event(order: Order, item: OrderItem, delta: int, role: str = "", now=None) -> ItemProgressEvent:
+    """Unsaved event for a ``delta`` change of ``item.prepared_qty`` (already applied)."""
+    now = now or timezone.now()
+    return ItemProgressEvent(
+        order_id=order.pk,
+        item_id=item.pk,
+        menu_item_id=item.menu_item_id,
+        floor=order.floor,
+        delta=delta,
+        prepared_qty=item.prepared_qty,
+        wait_seconds=max(0, int((now - order.created_at).total_seconds())),
+        role=(role or "")[:20],
+        created_at=now,
+    )
+
+
+def record_progress_events(events: Iterable[ItemProgressEvent]) -> None:
+    events = list(events)
+    if events:
+        ItemProgressEvent.objects.bulk_create(events, batch_size=500)
+
+
+def _percentile(counts: List[int], q: float) -> int | None:
+    """Upper bound (seconds) of the bucket holding the ``q`` quantile; None above the last bound."""
+    total = sum(counts)
+    if not total:
+        return None
+    seen = 0
+    for i, c in enumerate(counts):
+        seen += c
+        if seen >= q * total:
+            return BUCKET_MINUTES[i] * 60 if i < len(BUCKET_MINUTES) else None
+    return None
+
+
+def prep_time_stats(start: date | None = None, end: date | None = None, floor: str = "") -> List[Dict[str, Any]]:
+    """
+    Per-menu prep time (order created -> prepared) from the progress events in ``[start, end]``.
+
+    Each prepared unit counts once at the time it was marked; un-marking (negative
+    deltas) is ignored. Sorted slowest first. Hours are local event hours.
+    """
+    qs = ItemProgressEvent.objects.filter(delta__gt=0)
+    tz = timezone.get_current_timezone()
+    if start:
+        qs = qs.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min), tz))
+    if end:
+        qs = qs.filter(created_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz))
+    if floor:
+        qs = qs.filter(floor=floor)
+    bucket = Case(
+        *[When(wait_seconds__lte=m * 60, then=Value(i)) for i, m in enumerate(BUCKET_MINUTES)],
+        default=Value(len(BUCKET_MINUTES)),
+        output_field=IntegerField(),
+    )
+    rows = (
+        qs.annotate(hour=ExtractHour("created_at"), bucket=bucket)
+        .values("menu_item_id", "hour", "bucket")
+        .annotate(qty=Sum("delta"), wait=Sum(F("wait_seconds") * F("delta"), output_field=IntegerField()))
+        .order_by()
+    )
+
+    menus: Dict[int, Dict[str, Any]] = {}
+    for r in rows:
+        menu = menus.setdefault(r["menu_item_id"], {
+            "qty": 0, "wait": 0, "histogram": [0] * (len(BUCKET_MINUTES) + 1), "hourly": {},
+        })
+        menu["qty"] += r["qty"]
+        menu["wait"] += r["wait"] or 0
+        menu["histogram"][r["bucket"]] += r["qty"]
+        hour = menu["hourly"].setdefault(r["hour"], [0, 0])
+        hour[0] += r["qty"]
+        hour[1] += r["wait"] or 0
+
+    names = dict(MenuItem.objects.filter(id__in=menus).values_list("id", "name"))
+    result = [
+        {
+            "menu_item_id": menu_item_id,
+            "name": names.get(menu_item_id, ""),
+            "qty": m["qty"],
+            "avg_seconds": round(m["wait"] / m["qty"]),
+            "p50_seconds": _percentile(m["histogram"], 0.5),
+            "p90_seconds": _percentile(m["histogram"], 0.9),
+            "histogram": m["histogram"],
+            "hourly": [
+                {"hour": f"{hour:02d}:00", "qty": qty, "avg_seconds": round(wait / qty)}
+                for hour, (qty, wait) in sorted(m["hourly"].items())
+            ],
+        }
+        for menu_item_id, m in menus.items()
+    ]
+    result.sort(key=lambda m: (-m["avg_seconds"], m["name"]))
+    return result
@@ -0,0 +1,203 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, F, Value, When
+from django.utils import timezone
+
+from orders.models import ChangeKind, Order, OrderChange, OrderItem, OrderStatus, OrderType
+from .changes import item_change, record_changes, record_order_change
+from .menu_counters import MenuCounterDeltas, order_lines, status_change_lines
+from .metrics import record_progress_updates
+from .prep_times import progress_event, record_progress_events
+from .sales import record_sales_status_change
+
+
+def status_from_counters(order: Order) -> str:
+    """PREPARING while anything remains, READY otherwise (cancelled orders stay cancelled)."""
+    if order.status == OrderStatus.CANCELLED:
+        return order.status
+    return OrderStatus.PREPARING if order.remaining_qty > 0 else OrderStatus.READY
+
+
+def set_order_status(order_id: int, new_status: str) -> Order:
+    """
+    Lock the order, set its status and move the derived rows with it.
+
+    Menu counters and sales rollups follow the change (cancel/restore) in the same
+    transaction, and an ``ORDER_STATUS`` change is recorded for pollers and the stream.
+    Raises ``Order.DoesNotExist``. Every status write outside the progress paths goes here
+    (the status API and the admin).
+    """
+    with transaction.atomic():
+        order = Order.objects.select_for_update().get(pk=order_id)
+        old_status, order.status = order.status, new_status
+        order.save(update_fields=["status", "updated_at"])
+        if order.status != old_status:
+            # 취소/복구 시 메뉴별 집계와 매출 롤업도 같은 트랜잭션에서 옮긴다.
+            lines = order_lines([order.pk]).get(order.pk, [])
+            menu_deltas = MenuCounterDeltas()
+            menu_deltas.add_lines(order, old_status, status_change_lines(lines, {}))
+            menu_deltas.apply()
+            record_sales_status_change(order, old_status)
+        record_order_change(order, ChangeKind.ORDER_STATUS)
+    return order
+
+
+def set_item_prepared(order: Order, item: OrderItem, prepared_qty: int, role: str = "") -> bool:
+    """
+    Set ``item.prepared_qty`` and keep the order counters and status in step.
+
+    ``order`` must be locked by the caller (``select_for_update``) so the counter
+    arithmetic is safe. ``role`` is stored on the progress event. Returns True when
+    anything was written.
+    """
+    fields = []
+    old_status, old_prepared = order.status, item.prepared_qty
+    delta = prepared_qty - item.prepared_qty
+    if delta:
+        OrderItem.objects.filter(pk=item.pk).update(prepared_qty=prepared_qty)
+        item.prepared_qty = prepared_qty
+        order.remaining_qty = max(0, order.remaining_qty - delta)
+        fields.append("remaining_qty")
+
+    desired = status_from_counters(order)
+    if desired != order.status:
+        order.status = desired
+        fields.append("status")
+    if not fields:
+        return False
+    order.save(update_fields=fields + ["updated_at"])
+
+    menu_deltas = MenuCounterDeltas()
+    if order.status == old_status:
+        lines = [(item.menu_item_id, item.qty, old_prepared, item.prepared_qty)]
+    else:
+        # 상태가 바뀌면 같은 주문의 다른 품목도 '조리중 남은 수량' 집계가 달라진다.
+        lines = status_change_lines(order_lines([order.pk]).get(order.pk, []), {item.pk: old_prepared})
+    menu_deltas.add_lines(order, old_status, lines)
+    menu_deltas.apply()
+    if delta:
+        record_order_change(order, ChangeKind.ITEM_PROGRESS, item)
+        record_progress_events([progress_event(order, item, delta, role)])
+        record_progress_updates(1, "item")
+    else:
+        record_order_change(order, ChangeKind.ORDER_STATUS)
+    return True
+
+
+def apply_prepared_targets(
+    orders: Dict[int, Order],
+    items: Iterable[OrderItem],
+    targets: Dict[int, int],
+    role: str = "",
+) -> List[Order]:
+    """
+    Write many ``item_id -> prepared_qty`` targets with set-based statements.
+
+    ``orders`` holds the locked parent orders of ``items``. Items are written with a
+    single ``CASE`` UPDATE, counters and statuses are re-derived once per order and
+    saved with one ``bulk_update``. ``role`` is stored on the progress events.
+    Returns the orders whose status changed.
+    """
+    now = timezone.now()
+    by_id = {i.id: i for i in items}
+    old_status = {oid: o.status for oid, o in orders.items()}
+    old_prepared: Dict[int, int] = {}
+    changed_items: List[OrderItem] = []
+    whens = []
+    for item_id, target in targets.items():
+        item = by_id[item_id]
+        delta = target - item.prepared_qty
+        if not delta:
+            continue
+        whens.append(When(id=item_id, then=Value(target)))
+        old_prepared[item_id] = item.prepared_qty
+        item.prepared_qty = target
+        order = orders[item.order_id]
+        order.remaining_qty = max(0, order.remaining_qty - delta)
+        changed_items.append(item)
+
+    if whens:
+        OrderItem.objects.filter(id__in=[i.id for i in changed_items]).update(
+            prepared_qty=Case(*whens, output_field=IntegerField()),
+        )
+
+    touched = {i.order_id for i in changed_items}
+    status_changed: List[Order] = []
+    dirty: List[Order] = []
+    for order in orders.values():
+        desired = status_from_counters(order)
+        if desired != order.status:
+            order.status = desired
+            status_changed.append(order)
+        elif order.id not in touched:
+            continue
+        order.updated_at = now
+        dirty.append(order)
+    if dirty:
+        Order.objects.bulk_update(dirty, ["remaining_qty", "status", "updated_at"])
+
+    menu_deltas = MenuCounterDeltas()
+    flipped = {o.id for o in status_changed}
+    for item in changed_items:
+        if item.order_id not in flipped:
+            order = orders[item.order_id]
+            menu_deltas.add_lines(order, order.status, [
+                (item.menu_item_id, item.qty, old_prepared[item.id], item.prepared_qty),
+            ])
+    if flipped:
+        # 상태가 바뀐 주문은 바뀌지 않은 품목까지 포함해 다시 센다.
+        for order_id, lines in order_lines(flipped).items():
+            order = orders[order_id]
+            menu_deltas.add_lines(order, old_status[order_id], status_change_lines(lines, old_prepared))
+    menu_deltas.apply()
+
+    changes: List[OrderChange] = [item_change(orders[i.order_id], i) for i in changed_items]
+    changes += [
+        OrderChange(order_id=o.id, kind=ChangeKind.ORDER_STATUS, status=o.status)
+        for o in status_changed
+        if o.id not in touched
+    ]
+    record_changes(changes)
+    record_progress_events(
+        progress_event(orders[i.order_id], i, i.prepared_qty - old_prepared[i.id], role, now)
+        for i in changed_items
+    )
+    record_progress_updates(len(changed_items), "batch")
+    return status_changed
+
+
+def counters_for_items(items) -> dict[str, int]:
+    """Order counter values for in-memory ``OrderItem`` objects (used at creation time)."""
+    counters = {"total_qty": 0, "remaining_qty": 0, "dine_in_lines": 0, "takeout_lines": 0}
+    for i in items:
+        counters["total_qty"] += i.qty
+        counters["remaining_qty"] += max(0, i.qty - (i.prepared_qty or 0))
+        if i.service_mode == OrderType.TAKEOUT:
+            counters["takeout_lines"] += 1
+        else:
+            counters["dine_in_lines"] += 1
+    return counters
+
+
+def aggregate_counters(order_ids=None) -> dict[int, dict[str, int]]:
+    """Recompute the counters from ``OrderItem`` rows, keyed by order id."""
+    qs = OrderItem.objects.all()
+    if order_ids is not None:
+        qs = qs.filter(order_id__in=order_ids)
+    rows = qs.values("order_id").annotate(
+        total_qty=Sum("qty"),
+        remaining_qty=Sum(F("qty") - F("prepared_qty"), output_field=IntegerField()),
+        takeout_lines=Count("id", filter=Q(service_mode=OrderType.TAKEOUT)),
+        dine_in_lines=Count("id", filter=~Q(service_mode=OrderType.TAKEOUT)),
+    ).order_by()
+    return {
+        r["order_id"]: {
+            "total_qty": r["total_qty"] or 0,
+            "remaining_qty": max(0, r["remaining_qty"] or 0),
+            "dine_in_lines": r["dine_in_lines"],
+            "takeout_lines": r["takeout_lines"],
+        }
+        for r in rows
+    }
@@ -0,0 +1,35 @@
+from __future__ import annotations
+import threading
+
+from django.db import transaction
+
+_changed = threading.Condition()
+_generation = 0
+
+
+def notify_orders_changed() -> None:
+    """
+    Wake up the order streams of this process once the current transaction commits.
+
+    Streams in other worker processes pick the change up on their next poll.
+    """
+    transaction.on_commit(_wake_streams)
+
+
+def _wake_streams() -> None:
+    global _generation
+    with _changed:
+        _generation += 1
+        _changed.notify_all()
+
+
+def current_generation() -> int:
+    with _changed:
+        return _generation
+
+
+def wait_for_change(generation: int, timeout: float) -> int:
+    """Block until a change newer than ``generation`` is published or ``timeout`` expires."""
+    with _changed:
+        _changed.wait_for(lambda: _generation != generation, timeout=timeout)
+        return _generation
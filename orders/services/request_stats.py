@@ -0,0 +1,110 @@
+from __future__ import annotations
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict
+
+from django.conf import settings
+
+# 로그 간격 버킷 경계(0.1 ~ 약 1.7e7, 인접 경계 10% 차이): ms, 쿼리 수, 바이트 모두 같은 표를 쓴다.
+BOUNDS = tuple(0.1 * 1.1 ** i for i in range(200))
+METRICS = ("wall_ms", "db_ms", "queries", "bytes")
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are bucket upper bounds (within ~10%)."""
+
+    __slots__ = ("counts", "n", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.n = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BOUNDS, value)] += 1
+        self.n += 1
+        self.total += value
+
+    def merge(self, other: Histogram) -> None:
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.n += other.n
+        self.total += other.total
+
+    def percentile(self, q: float) -> float:
+        if not self.n:
+            return 0.0
+        rank = q * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return BOUNDS[min(i, len(BOUNDS) - 1)]
+        return BOUNDS[-1]
+
+
+class RollingRequestStats:
+    """
+    Per-endpoint histograms over the last one to two windows (current + previous).
+
+    Recording is a lock and four bucket increments, so it can stay on in production.
+    The numbers are per process; each worker keeps its own.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window = max(1.0, float(window_seconds))
+        self._lock = threading.Lock()
+        self._current: Dict[str, Dict[str, Histogram]] = {}
+        self._previous: Dict[str, Dict[str, Histogram]] = {}
+        self._started = time.monotonic()
+
+    def record(self, endpoint: str, **values: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._started >= self.window:
+                # 한 창 이상 비어 있었으면 이전 창도 버린다.
+                stale = now - self._started >= 2 * self.window
+                self._previous = {} if stale else self._current
+                self._current = {}
+                self._started = now
+            hists = self._current.get(endpoint)
+            if hists is None:
+                hists = self._current[endpoint] = {m: Histogram() for m in METRICS}
+            for metric in METRICS:
+                hists[metric].observe(values[metric])
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """``endpoint -> metric -> {count, mean, p50, p95, p99}`` over the retained windows."""
+        with self._lock:
+            merged: Dict[str, Dict[str, Histogram]] = {}
+            for windows in (self._previous, self._current):
+                for endpoint, hists in windows.items():
+                    target = merged.setdefault(endpoint, {m: Histogram() for m in METRICS})
+                    for metric, hist in hists.items():
+                        target[metric].merge(hist)
+        result = {}
+        for endpoint, hists in sorted(merged.items()):
+            result[endpoint] = {
+                metric: {
+                    "count": hist.n,
+                    "mean": hist.total / hist.n if hist.n else 0.0,
+                    **{name: hist.percentile(q) for name, q in QUANTILES},
+                }
+                for metric, hist in hists.items()
+            }
+        return result
+
+
+_stats: RollingRequestStats | None = None
+_stats_lock = threading.Lock()
+
+
+def request_stats() -> RollingRequestStats:
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = RollingRequestStats(getattr(settings, "ORDERS_TIMING_WINDOW_SECONDS", 300))
+        return _stats
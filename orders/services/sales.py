@@ -0,0 +1,130 @@
+from __future__ import annotations
+from datetime import date
+from typing import Dict, Iterable, Tuple
+
+from django.db.models import Count, F, IntegerField, Sum
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from orders.models import Order, OrderItem, OrderStatus, SalesHourly, SalesMenuDaily
+from .increments import add_to_rows
+
+# 매출 집계 대상 상태(대시보드 기준과 동일)
+COUNTED_STATUSES = (OrderStatus.PREPARING, OrderStatus.READY)
+
+HOURLY_KEY = ("date", "hour", "floor", "payment_method")
+HOURLY_VALUES = ("orders", "revenue", "cash_amount", "ticket_amount")
+MENU_KEY = ("date", "floor", "menu_item")
+MENU_VALUES = ("qty", "amount")
+
+Rollup = Dict[tuple, Tuple[int, ...]]
+
+
+def record_sales(entries: Iterable[tuple[Order, Iterable[OrderItem]]]) -> None:
+    """Add newly created orders (and their items) to the rollups."""
+    _add_sales(
+        [(order, items) for order, items in entries if order.status in COUNTED_STATUSES], 1,
+    )
+
+
+def record_sales_status_change(order: Order, old_status: str) -> None:
+    """Move ``order`` in or out of the rollups when a status change crosses cancellation."""
+    was = old_status in COUNTED_STATUSES
+    now = order.status in COUNTED_STATUSES
+    if was == now:
+        return
+    items = OrderItem.objects.filter(order_id=order.pk).only("menu_item_id", "qty", "unit_price")
+    _add_sales([(order, items)], 1 if now else -1)
+
+
+def _add_sales(entries, sign: int) -> None:
+    hourly: Dict[tuple, list[int]] = {}
+    menu: Dict[tuple, list[int]] = {}
+    for order, items in entries:
+        if order.order_date is None:
+            continue
+        key = (order.order_date, timezone.localtime(order.created_at).hour, order.floor, order.payment_method)
+        _accumulate(hourly, key, sign, (
+            1,
+            order.total_price or 0,
+            order.received_cash_amount or 0,
+            order.received_ticket_amount or 0,
+        ))
+        for item in items:
+            _accumulate(
+                menu, (order.order_date, order.floor, item.menu_item_id), sign,
+                (item.qty, item.qty * (item.unit_price or 0)),
+            )
+    add_to_rows(SalesHourly, HOURLY_KEY, HOURLY_VALUES, hourly.items())
+    add_to_rows(SalesMenuDaily, MENU_KEY, MENU_VALUES, menu.items())
+
+
+def _accumulate(rows: Dict[tuple, list[int]], key: tuple, sign: int, values: tuple[int, ...]) -> None:
+    row = rows.setdefault(key, [0] * len(values))
+    for i, value in enumerate(values):
+        row[i] += sign * value
+
+
+def _date_filter(prefix: str, start: date | None, end: date | None) -> dict:
+    filters = {f"{prefix}__isnull": False}
+    if start:
+        filters[f"{prefix}__gte"] = start
+    if end:
+        filters[f"{prefix}__lte"] = end
+    return filters
+
+
+def aggregate_sales(start: date | None = None, end: date | None = None) -> tuple[Rollup, Rollup]:
+    """Recompute ``(hourly, menu)`` rollup rows from the raw orders in ``[start, end]``."""
+    orders = Order.objects.filter(status__in=COUNTED_STATUSES, **_date_filter("order_date", start, end))
+    hourly_rows = (
+        orders.annotate(hour=ExtractHour("created_at"))
+        .values("order_date", "hour", "floor", "payment_method")
+        .annotate(
+            n=Count("id"),
+            revenue=Sum("total_price"),
+            cash=Sum("received_cash_amount"),
+            ticket=Sum("received_ticket_amount"),
+        )
+        .order_by()
+    )
+    hourly = {
+        (r["order_date"], r["hour"], r["floor"], r["payment_method"]): (
+            r["n"], r["revenue"] or 0, r["cash"] or 0, r["ticket"] or 0,
+        )
+        for r in hourly_rows
+    }
+
+    menu_rows = (
+        OrderItem.objects.filter(
+            order__status__in=COUNTED_STATUSES, **_date_filter("order__order_date", start, end),
+        )
+        .values("order__order_date", "order__floor", "menu_item_id")
+        .annotate(
+            sold=Sum("qty"),
+            total=Sum(F("qty") * F("unit_price"), output_field=IntegerField()),
+        )
+        .order_by()
+    )
+    menu = {
+        (r["order__order_date"], r["order__floor"], r["menu_item_id"]): (r["sold"] or 0, r["total"] or 0)
+        for r in menu_rows
+    }
+    return hourly, menu
+
+
+def stored_sales(start: date | None = None, end: date | None = None) -> tuple[Rollup, Rollup]:
+    """The rollup rows currently stored for ``[start, end]`` (all-zero rows omitted)."""
+    hourly = {
+        tuple(r[:4]): tuple(r[4:])
+        for r in SalesHourly.objects.filter(**_date_filter("date", start, end))
+        .values_list(*HOURLY_KEY, *HOURLY_VALUES)
+        if any(r[4:])
+    }
+    menu = {
+        tuple(r[:3]): tuple(r[3:])
+        for r in SalesMenuDaily.objects.filter(**_date_filter("date", start, end))
+        .values_list("date", "floor", "menu_item_id", *MENU_VALUES)
+        if any(r[3:])
+    }
+    return hourly, menu
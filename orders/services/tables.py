@@ -0,0 +1,59 @@
+from __future__ import annotations
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from orders.models import Table
+from .catalog import catalog_version
+
+
+class TableRef(NamedTuple):
+    id: int
+    number: int
+    name: str
+
+    def as_instance(self) -> Table:
+        # FK 할당/직렬화용 경량 인스턴스(추가 조회 없음)
+        return Table(id=self.id, number=self.number, name=self.name, is_active=True)
+
+
+class _Registry(NamedTuple):
+    version: int
+    by_number: Dict[int, TableRef]
+    ordered: List[TableRef]
+
+
+_lock = threading.Lock()
+_registry: Optional[_Registry] = None
+
+
+def _load(version: int) -> _Registry:
+    rows = (
+        Table.objects.filter(is_active=True)
+        .order_by("sort_index", "number")
+        .values_list("id", "number", "name")
+    )
+    ordered = [TableRef(*row) for row in rows]
+    return _Registry(version, {t.number: t for t in ordered}, ordered)
+
+
+def _current(version: int | None = None) -> _Registry:
+    """Process-local table map, reloaded in one query whenever the catalog version moves."""
+    global _registry
+    version = catalog_version() if version is None else version
+    registry = _registry
+    if registry is not None and registry.version == version:
+        return registry
+    with _lock:
+        if _registry is None or _registry.version != version:
+            _registry = _load(version)
+        return _registry
+
+
+def get_table_ref(number: int, version: int | None = None) -> Optional[TableRef]:
+    """Active table with ``number``, or None."""
+    return _current(version).by_number.get(number)
+
+
+def active_tables(version: int | None = None) -> List[TableRef]:
+    """All active tables in display order."""
+    return _current(version).ordered
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MenuItem, Table
+from .services.catalog import bump_catalog_version
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=Table)
+@receiver(post_delete, sender=Table)
+def _catalog_changed(sender, **kwargs):
+    # 관리자 가격/노출 변경이 모든 워커에 즉시 반영되도록 카탈로그 버전을 올린다.
+    bump_catalog_version()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from django.utils import timezone
+
+from orders.models import ChangeKind, OrderChange
+from orders.services.changes import CURSOR_GAP_WAIT, changes_since
+
+
+class ChangesSinceTests(TestCase):
+    """The delta cursor never moves past a seq that may still commit."""
+
+    def _change(self, seq: int, age=None) -> None:
+        OrderChange.objects.create(seq=seq, order_id=seq, kind=ChangeKind.ORDER_STATUS)
+        if age is not None:
+            OrderChange.objects.filter(seq=seq).update(created_at=timezone.now() - age)
+
+    def test_contiguous_rows_advance_cursor(self):
+        for seq in (1, 2, 3):
+            self._change(seq)
+        changed, cursor = changes_since(0, 10)
+        self.assertEqual([seq for seq, _ in changed], [1, 2, 3])
+        self.assertEqual(cursor, 3)
+
+    def test_recent_gap_holds_cursor(self):
+        # 4번을 받은 트랜잭션이 아직 커밋되지 않은 상황
+        for seq in (1, 2, 3, 5, 6):
+            self._change(seq)
+        changed, cursor = changes_since(0, 10)
+        self.assertEqual([seq for seq, _ in changed], [1, 2, 3, 5, 6])
+        self.assertEqual(cursor, 3)
+
+        # 늦게 커밋되면 다음 조회에서 빠짐없이 받는다.
+        self._change(4)
+        changed, cursor = changes_since(cursor, 10)
+        self.assertEqual([seq for seq, _ in changed], [4, 5, 6])
+        self.assertEqual(cursor, 6)
+
+    def test_settled_gap_is_skipped(self):
+        # 롤백으로 비어 버린 번호는 대기 시간이 지나면 건너뛴다.
+        self._change(1)
+        self._change(3, age=CURSOR_GAP_WAIT * 2)
+        self._change(5)
+        changed, cursor = changes_since(0, 10)
+        self.assertEqual([seq for seq, _ in changed], [1, 3, 5])
+        self.assertEqual(cursor, 3)
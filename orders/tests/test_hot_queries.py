@@ -0,0 +1,91 @@
+from __future__ import annotations
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from orders.management.commands._seed import seed_orders
+from orders.models import FloorChoices, MenuDayCounter, MenuItem, Order, OrderStatus
+from orders.services.order_rows import after_page_cursor
+from orders.views.api import (
+    _active_orders, _allocatable_orders, _menu_counts_queryset, _menu_pending_queryset, _order_list_queryset,
+)
+
+ACTIVE_DAY_INDEX = "ord_active_day_idx"
+CREATED_AT_INDEX = "orders_order_created_at_20b8d253"
+
+
+def _unique_index(model, constraint: str) -> str:
+    # SQLite는 CREATE TABLE 안의 UNIQUE 제약에 sqlite_autoindex_* 이름을 붙인다.
+    if connection.vendor != "sqlite":
+        return constraint
+    table = model._meta.db_table
+    fields = next(c.fields for c in model._meta.constraints if c.name == constraint)
+    columns = [model._meta.get_field(f).column for f in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA index_list({connection.ops.quote_name(table)})")
+        for _, name, _, origin, _ in cursor.fetchall():
+            if origin != "u":
+                continue
+            cursor.execute(f"PRAGMA index_info({connection.ops.quote_name(name)})")
+            if [row[2] for row in cursor.fetchall()] == columns:
+                return name
+    raise AssertionError(f"{constraint} 인덱스가 없습니다.")
+
+
+class HotQueryPlanTests(TestCase):
+    """
+    The hot endpoints' queries use their intended index on a seeded month of orders.
+
+    Plans match a 100k-order seed (checked by hand); the smaller seed keeps the suite fast.
+    """
+
+    SEED_ORDERS = 3000
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_orders(cls.SEED_ORDERS, days=30)
+        call_command("rebuild_menu_counters", stdout=StringIO())
+        with connection.cursor() as cursor:
+            # 플래너가 시드 분포를 보도록 통계를 갱신한다.
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.floor = FloorChoices.B1
+
+    def assertUsesIndex(self, qs, index: str):
+        plan = qs.explain()
+        self.assertIn(index, plan, f"{index}를 쓰지 않습니다:\n{plan}")
+
+    def test_stats_menu_counts(self):
+        self.assertUsesIndex(_menu_counts_queryset(self.floor, self.today), ACTIVE_DAY_INDEX)
+
+    def test_kitchen_allocate(self):
+        menu_id = MenuItem.objects.values_list("id", flat=True).first()
+        qs = Order.objects.filter(
+            id__in=_allocatable_orders(menu_id, self.floor, self.today), status=OrderStatus.PREPARING,
+        ).order_by("id")
+        self.assertUsesIndex(qs, ACTIVE_DAY_INDEX)
+
+    def test_kitchen_board_counters(self):
+        self.assertUsesIndex(_active_orders(self.floor, self.today), ACTIVE_DAY_INDEX)
+
+    def test_kitchen_menu_summary(self):
+        self.assertUsesIndex(
+            _menu_pending_queryset(self.floor, self.today), _unique_index(MenuDayCounter, "uq_menu_day_counter"),
+        )
+
+    def test_kitchen_board_orders(self):
+        # 보드 목록(조리 중, 최신순 LIMIT)은 created_at 역순 인덱스를 따라가다 멈춘다.
+        request = RequestFactory().get("/orders/api/orders/", {"floor": self.floor, "status": OrderStatus.PREPARING})
+        qs, error = _order_list_queryset(request)
+        self.assertIsNone(error)
+        self.assertUsesIndex(qs[:50], CREATED_AT_INDEX)
+
+    def test_order_history_page(self):
+        history = Order.objects.filter(floor=self.floor).order_by("-created_at", "-id")
+        middle = history.values_list("created_at", "id")[self.SEED_ORDERS // 2:][:1].first()
+        self.assertUsesIndex(after_page_cursor(history, middle)[:50], CREATED_AT_INDEX)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import threading
+from collections import Counter
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from orders.models import FloorChoices, MenuItem, Order, OrderItem, OrderStatus, OrderType, Table
+from orders.services import create_order
+from orders.services.numbering import BlockAllocator
+
+THREADS = 8
+ORDERS_PER_THREAD = 25
+BLOCK_SIZE = 10
+
+
+def _run_threads(target, count: int = THREADS) -> list[str]:
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def run():
+        try:
+            target()
+        except Exception as exc:  # noqa: BLE001 - 스레드 오류는 모아서 단언한다
+            with lock:
+                errors.append(repr(exc))
+        finally:
+            connection.close()
+
+    pool = [threading.Thread(target=run) for _ in range(count)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return errors
+
+
+class ConcurrentNumberingTests(TransactionTestCase):
+    """Many threads numbering orders at once never collide on ``uq_floor_date_no``."""
+
+    def setUp(self):
+        self.table = Table.objects.create(number=3)
+        self.menu = MenuItem.objects.create(name="떡볶이", price=4000)
+        self.floor = FloorChoices.B1
+
+    def _numbers(self) -> list[int]:
+        rows = list(Order.objects.values_list("floor", "order_date", "order_no"))
+        self.assertEqual([key for key, n in Counter(rows).items() if n > 1], [], "중복 번호")
+        self.assertNotIn(None, [no for _, _, no in rows], "번호 없는 주문")
+        return sorted(no for _, _, no in rows)
+
+    def _insert_with_allocator(self, allocator: BlockAllocator) -> None:
+        for _ in range(ORDERS_PER_THREAD):
+            order_date, (no,) = allocator.take(self.floor)
+            with transaction.atomic():
+                Order.objects.create(
+                    floor=self.floor, order_type=OrderType.DINE_IN, table=self.table,
+                    status=OrderStatus.PREPARING, order_no=no, order_date=order_date,
+                )
+
+    def test_shared_block_allocator(self):
+        allocator = BlockAllocator(BLOCK_SIZE)
+        errors = _run_threads(lambda: self._insert_with_allocator(allocator))
+        self.assertEqual(errors, [])
+        numbers = self._numbers()
+        self.assertEqual(len(numbers), THREADS * ORDERS_PER_THREAD)
+        # 한 할당기에 남는 번호는 블록 하나 미만이다.
+        self.assertLess(numbers[-1], len(numbers) + BLOCK_SIZE)
+
+    def test_allocator_per_process(self):
+        # 스레드마다 할당기를 둬 여러 워커 프로세스를 흉내 낸다.
+        errors = _run_threads(lambda: self._insert_with_allocator(BlockAllocator(BLOCK_SIZE)))
+        self.assertEqual(errors, [])
+        numbers = self._numbers()
+        self.assertEqual(len(numbers), THREADS * ORDERS_PER_THREAD)
+        # 워커마다 최대 한 블록 미만이 버려진다(다 쓰지 못한 마지막 블록).
+        self.assertLess(numbers[-1], len(numbers) + THREADS * BLOCK_SIZE)
+
+    def test_create_order_without_blocks(self):
+        def worker():
+            for _ in range(ORDERS_PER_THREAD):
+                order = Order(floor=self.floor, order_type=OrderType.DINE_IN, table=self.table)
+                create_order(order, [OrderItem(menu_item=self.menu, qty=1, unit_price=self.menu.price)])
+
+        errors = _run_threads(worker)
+        self.assertEqual(errors, [])
+        numbers = self._numbers()
+        if connection.vendor != "postgresql":
+            # 카운터 증가가 주문과 함께 커밋되므로 공백 없이 1부터 이어진다.
+            self.assertEqual(numbers, list(range(1, THREADS * ORDERS_PER_THREAD + 1)))
+        else:
+            self.assertEqual(len(numbers), THREADS * ORDERS_PER_THREAD)
+        self.assertEqual({d for d in Order.objects.values_list("order_date", flat=True)}, {timezone.localdate()})
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import FloorChoices, MenuItem, Order, OrderItem, OrderType, PaymentMethod, Table
+from orders.services import create_order
+
+
+def _statements(ctx: CaptureQueriesContext) -> list[str]:
+    # 테스트 트랜잭션 안이라 atomic()이 세이브포인트로 바뀐다. 세이브포인트는 세지 않는다.
+    return [
+        q["sql"] for q in ctx.captured_queries
+        if not q["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT"))
+    ]
+
+
+class CreateOrderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.table = Table.objects.create(number=3)
+        cls.menus = [
+            MenuItem.objects.create(name="떡볶이", price=4000),
+            MenuItem.objects.create(name="순대", price=5000),
+        ]
+
+    def _new_order(self) -> tuple[Order, list[OrderItem]]:
+        order = Order(
+            floor=FloorChoices.B1, order_type=OrderType.DINE_IN, table=self.table,
+            payment_method=PaymentMethod.CASH, received_amount=20000,
+        )
+        items = [
+            OrderItem(menu_item=m, qty=2, unit_price=m.price, service_mode=OrderType.DINE_IN)
+            for m in self.menus
+        ]
+        return order, items
+
+    def test_statement_budget(self):
+        # 번호, 주문, 품목, 메뉴 집계, 시간별/메뉴별 매출 롤업, 변경 로그
+        order, items = self._new_order()
+        with CaptureQueriesContext(connection) as ctx:
+            create_order(order, items)
+        statements = _statements(ctx)
+        self.assertEqual(len(statements), 7, "\n".join(statements))
+        self.assertEqual(order.order_no, 1)
+        self.assertEqual(order.total_price, 18000)
+        self.assertEqual(order.remaining_qty, 4)
+        self.assertTrue(all(item.pk for item in items))
+
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL sequences never roll back")
+    def test_failed_order_keeps_its_number(self):
+        def fail(created: Order) -> None:
+            raise RuntimeError("boom")
+
+        order, items = self._new_order()
+        with self.assertRaises(RuntimeError):
+            create_order(order, items, on_created=fail)
+        self.assertFalse(Order.objects.exists())
+
+        order, items = self._new_order()
+        create_order(order, items)
+        self.assertEqual(order.order_no, 1)
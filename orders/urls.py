@@ -2,7 +2,7 @@
 from __future__ import annotations
 from django.urls import path
 from django.views.generic import RedirectView
-from orders.views import pages, api, auth 
+from orders.views import pages, api, auth, stream, metrics
 
 app_name = "orders"
 
@@ -23,10 +23,19 @@ urlpatterns = [
     path("tables/",                 api.tables_list,          name="tables"),
     path("menus/",                  api.menus_list,           name="menus"),
     path("api/orders/",             api.orders_collection,    name="orders-collection"),
+    path("api/orders/stream",       stream.orders_stream,     name="orders-stream"),
+    path("api/orders/sync",         api.orders_sync,          name="orders-sync"),
     path("api/orders/<int:order_id>/detail", api.order_detail, name="order-detail"),
     path("api/orders/<int:order_id>/status", api.order_status, name="order-status"),
     path("api/orders/items/<int:item_id>/progress", api.order_item_progress, name="order-item-progress"),
     path("api/kitchen/menu-summary", api.kitchen_menu_summary, name="kitchen-menu-summary"),
+    path("api/kitchen/progress",    api.kitchen_progress_batch, name="kitchen-progress"),
+    path("api/kitchen/allocate",    api.kitchen_allocate,     name="kitchen-allocate"),
     path("api/stats/menu-counts",   api.stats_menu_counts,    name="stats-menu-counts"),
     path("api/stats/dashboard",     api.stats_dashboard,      name="stats-dashboard"),
+    path("api/stats/prep-times",    api.stats_prep_times,     name="stats-prep-times"),
+    path("api/board/snapshot",      api.board_snapshot,       name="board-snapshot"),
+
+    # 운영 메트릭(Prometheus)
+    path("metrics",                 metrics.metrics,          name="metrics"),
 ]
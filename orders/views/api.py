@@ -1,23 +1,42 @@
 from __future__ import annotations
+import hashlib
 import json
+import uuid
+from contextlib import contextmanager
 from typing import Any, Dict, List
 
-from django.http import JsonResponse, HttpRequest, HttpResponseBadRequest, Http404
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, Http404
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt  # 개발 편의. 운영 전 제거 권장.
-from django.views.decorators.cache import cache_page
-from django.db import transaction
-from django.db.models import Sum, F, IntegerField, Count, Max
-from django.db.models.functions import TruncHour
+from django.db import connection, transaction, IntegrityError
+from django.db.models import Sum, F, IntegerField, Count, Max, Q
 from django.utils import timezone
-from functools import lru_cache
+from django.utils.dateparse import parse_datetime
 from datetime import datetime
 
 from orders.models import (
     FloorChoices, PaymentMethod, OrderType, OrderStatus, OrderSource,
-    Table, MenuItem, Order, OrderItem,
+    MenuItem, Order, OrderItem, IdempotencyKey, MenuDayCounter,
+    SalesHourly, SalesMenuDaily,
 )
-from orders.services import allocate_floor_order_no
+from orders.services import create_order, create_orders
+from orders.services.order_rows import (
+    after_page_cursor, decode_page_cursor, encode_page_cursor, serialize_order_rows,
+)
+from orders.services.prep_times import BUCKET_MINUTES, prep_time_stats
+from orders.services.progress import apply_prepared_targets, set_item_prepared, set_order_status
+from orders.services.changes import (
+    changes_since, cursor_is_stale, decode_cursor, encode_cursor, latest_seq,
+)
+from orders.services.idempotency import (
+    MAX_KEY_LENGTH, find_idempotent_response, is_client_uuid_conflict, is_key_conflict,
+    remember_response, request_fingerprint,
+)
+from orders.services.catalog import cached_catalog_body, catalog_version
+from orders.services.tables import active_tables, get_table_ref
+from .responses import conditional_get, dumps, json_response
+
+DELTA_BATCH = 500
 
 
 # ---------- 공용 ----------
@@ -97,94 +116,294 @@ def _date_limits(request: HttpRequest):
     return start_date, end_date
 
 
-def _filtered_orders(request: HttpRequest):
-    qs = Order.objects.filter(
-        status__in=[OrderStatus.PREPARING, OrderStatus.READY],
-        order_date=datetime(2025, 10, 18).date(),
-    )
-    return qs, datetime(2025, 10, 18).date(), datetime(2025, 10, 18).date()
+def _stats_period(request: HttpRequest):
+    """Validated ``(start_date, end_date, floor)`` of a stats query string, and an error or None."""
+    start_date, end_date = _date_limits(request)
+    for name, parsed in (("start_date", start_date), ("end_date", end_date)):
+        if request.GET.get(name) and parsed is None:
+            return (None, None, ""), f"{name}는 YYYY-MM-DD 형식이어야 합니다."
+    if start_date and end_date and start_date > end_date:
+        return (None, None, ""), "start_date가 end_date보다 늦습니다."
+    floor = (request.GET.get("floor") or "").upper()
+    if floor and floor not in FloorChoices.values:
+        return (None, None, ""), "유효하지 않은 floor 값입니다."
+    return (start_date, end_date, floor), None
+
+
+# ---------- 조건부 GET(ETag) ----------
+def _stamp(moment) -> str:
+    return str(int(moment.timestamp() * 1_000_000)) if moment else "0"
+
+
+def _catalog_version(request: HttpRequest) -> int:
+    # 요청당 한 번만 공유 캐시에서 버전을 읽는다(ETag와 본문 키가 같은 버전을 보도록).
+    if not hasattr(request, "_catalog_version"):
+        request._catalog_version = catalog_version()
+    return request._catalog_version
+
+
+def _tables_validators(request: HttpRequest):
+    return f"tables-{_catalog_version(request)}", None
+
 
+def _menus_validators(request: HttpRequest):
+    return f"menus-{_menu_scope(request)}-{_catalog_version(request)}", None
 
-@lru_cache(maxsize=128)
-def _get_table_by_number(number: int) -> Table:
-    return Table.objects.get(number=number, is_active=True)
+
+def _order_validators(request: HttpRequest, order_id: int):
+    updated_at = Order.objects.filter(id=order_id).values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        return None, None
+    return f"order-{order_id}-{_stamp(updated_at)}", updated_at
+
+
+def _orders_list_validators(request: HttpRequest):
+    qs, error = _order_list_queryset(request)
+    if error:
+        return None, None
+    if request.GET.get("since"):
+        # delta 본문은 OrderChange만으로 만들어지므로 최신 seq가 곧 본문 버전이다(주문 집계 없음).
+        raw = f"{request.GET.urlencode()}|{latest_seq()}"
+    else:
+        # 전체 목록은 OrderChange를 남기지 않는 수정(관리자 메모/테이블 변경 등)도 반영해야 하므로
+        # 필터된 주문의 max(updated_at)+count를 함께 쓴다. QuerySet.update()로 주문을 고칠 때는
+        # updated_at도 같이 바꿔야 이 값이 움직인다.
+        agg = qs.order_by().aggregate(latest=Max("updated_at"), n=Count("id"))
+        raw = f"{request.GET.urlencode()}|{_stamp(agg['latest'])}|{agg['n']}|{latest_seq()}"
+    return "orders-" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20], None
 
 
 # ---------- 메뉴/테이블 ----------
-@cache_page(60)
 @require_http_methods(["GET"])
+@conditional_get(_tables_validators)
 def tables_list(request: HttpRequest):
-    qs = Table.objects.filter(is_active=True).order_by("sort_index", "number")
-    items = [{"id": t.id, "number": t.number, "name": t.name} for t in qs]
-    return JsonResponse({"items": items})
+    version = _catalog_version(request)
+
+    def build() -> bytes:
+        items = [t._asdict() for t in active_tables(version)]
+        return dumps({"items": items})
+
+    body = cached_catalog_body("tables", version, build)
+    return HttpResponse(body, content_type="application/json")
+
+
+def _menu_scope(request: HttpRequest) -> str:
+    scope = (request.GET.get("scope") or "").upper()
+    return "KITCHEN" if scope in ("KITCHEN", "B1") else "COUNTER"
 
 
-@cache_page(60)
 @require_http_methods(["GET"])
+@conditional_get(_menus_validators)
 def menus_list(request: HttpRequest):
-    scope = (request.GET.get("scope") or "").upper()
-    channel = (request.GET.get("channel") or "").upper()  # 선택
+    scope = _menu_scope(request)
 
-    qs = MenuItem.objects.filter(is_active=True)
+    def build() -> bytes:
+        qs = MenuItem.objects.filter(is_active=True)
 
-    # 스코프/채널 필터
-    if scope in ("KITCHEN", "B1"):
-        qs = qs.filter(visible_kitchen=True)
-    else:
-        qs = qs.filter(visible_counter=True)
+        # 스코프 필터
+        if scope == "KITCHEN":
+            qs = qs.filter(visible_kitchen=True)
+        else:
+            qs = qs.filter(visible_counter=True)
 
-    qs = qs.order_by("sort_index", "name")
+        qs = qs.order_by("sort_index", "name")
 
-    items = [
-        {"id": m.id, "name": m.name, "price": m.price, "sort_index": m.sort_index}
-        for m in qs
-    ]
-    return JsonResponse({"items": items})
+        items = [
+            {"id": m.id, "name": m.name, "price": m.price, "sort_index": m.sort_index}
+            for m in qs
+        ]
+        return dumps({"items": items})
+
+    body = cached_catalog_body(f"menus-{scope}", _catalog_version(request), build)
+    return HttpResponse(body, content_type="application/json")
 
 
 # ---------- 주문 목록/생성 ----------
+def _orders_delta(qs, since: int) -> HttpResponse:
+    """
+    Return only the orders changed after change sequence ``since``.
+
+    Changed orders that still match the list filter go to ``results``; the rest are
+    returned as ``removed`` tombstones so the client can drop them. A cursor that
+    predates the retained change log answers ``reset`` and the client reloads.
+    """
+    if cursor_is_stale(since):
+        return json_response({
+            "results": [], "count": 0, "removed": [], "reset": True,
+            "next_cursor": encode_cursor(latest_seq()), "has_more": False,
+        })
+    changed, next_cursor = changes_since(since, DELTA_BATCH)
+    ids = list(dict.fromkeys(order_id for _, order_id in changed))
+    data = serialize_order_rows(qs.filter(id__in=ids)) if ids else []
+    matched_ids = {o["id"] for o in data}
+    return json_response({
+        "results": data,
+        "count": len(data),
+        "removed": [pk for pk in ids if pk not in matched_ids],
+        "reset": False,
+        "next_cursor": encode_cursor(next_cursor),
+        # 커서가 빈 번호에 멈춰 있으면 같은 배치만 다시 받게 되므로 이어 받지 않는다.
+        "has_more": len(changed) == DELTA_BATCH and next_cursor == changed[-1][0],
+    })
+
+
+# 주방 화면 범위: 품목 service_mode로 유지되는 주문별 라인 카운터로 거른다.
+ORDER_SCOPES = {
+    "ALL": Q(),
+    "HALL": Q(dine_in_lines__gt=0),  # 홀 주문 + 홀/포장 혼합 주문
+    "TAKEOUT": Q(dine_in_lines=0, takeout_lines__gt=0),  # 순수 포장 주문
+}
+
+
+def _order_list_queryset(request: HttpRequest):
+    """Filtered order list queryset for the GET query string, or ``(None, error)``."""
+    floor = (request.GET.get("floor") or "").upper()
+    status = (request.GET.get("status") or "").upper()
+    scope = (request.GET.get("scope") or "ALL").upper()
+    types_raw = request.GET.get("types") or ""
+    types = [t.strip().upper() for t in types_raw.split(",") if t.strip()]
+
+    qs = Order.objects.order_by("-created_at", "-id")
+    if floor and floor != FloorChoices.B1:
+        return None, "floor 파라미터는 B1만 허용됩니다."
+    if scope not in ORDER_SCOPES:
+        return None, "scope 파라미터는 HALL/TAKEOUT/ALL만 허용됩니다."
+    if floor == FloorChoices.B1:
+        qs = qs.filter(floor=floor)
+    if status in (OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.CANCELLED):
+        qs = qs.filter(status=status)
+    if types:
+        qs = qs.filter(order_type__in=types)
+    return qs.filter(ORDER_SCOPES[scope]), None
+
+
+def _session_role(request: HttpRequest) -> str:
+    return (request.session.get("role") or "").upper()
+
+
+def _list_limit(request: HttpRequest) -> int:
+    try:
+        limit = int(request.GET.get("limit") or 50)
+    except ValueError:
+        limit = 50
+    return max(1, min(limit, 200))
+
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
+@conditional_get(_orders_list_validators)
 def orders_collection(request: HttpRequest):
     if request.method == "GET":
-        floor = (request.GET.get("floor") or "").upper()
-        status = (request.GET.get("status") or "").upper()
-        types_raw = request.GET.get("types") or ""
-        types = [t.strip().upper() for t in types_raw.split(",") if t.strip()]
-        try:
-            limit = int(request.GET.get("limit") or 50)
-        except ValueError:
-            limit = 50
-        limit = max(1, min(limit, 200))
-
-        qs = _order_base_queryset().order_by("-created_at", "-id")
-        if floor and floor != FloorChoices.B1:
-            return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
-        if floor == FloorChoices.B1:
-            qs = qs.filter(floor=floor)
-        if status in (OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.CANCELLED):
-            qs = qs.filter(status=status)
-        if types:
-            qs = qs.filter(order_type__in=types)
-
-        data = [_serialize_order(o) for o in qs[:limit]]
-        return JsonResponse({"results": data, "count": len(data)})
+        limit = _list_limit(request)
+        qs, error = _order_list_queryset(request)
+        if error:
+            return HttpResponseBadRequest(error)
+
+        since_raw = request.GET.get("since")
+        if since_raw not in (None, ""):
+            since = decode_cursor(since_raw)
+            if since is None:
+                return HttpResponseBadRequest("since 값이 유효하지 않습니다.")
+            return _orders_delta(qs, since)
+
+        # 이전 페이지: cursor는 (-created_at, -id) 순서의 마지막 주문 위치(next_page_cursor 값).
+        page_raw = request.GET.get("cursor")
+        if page_raw not in (None, ""):
+            position = decode_page_cursor(page_raw)
+            if position is None:
+                return HttpResponseBadRequest("cursor 값이 유효하지 않습니다.")
+            qs = after_page_cursor(qs, position)
+
+        # 목록보다 먼저 커서를 잡아야 그 사이의 변경을 다음 delta에서 놓치지 않는다.
+        cursor = latest_seq()
+        data = serialize_order_rows(qs[:limit + 1])
+        has_more = len(data) > limit
+        data = data[:limit]
+        return json_response({
+            "results": data,
+            "count": len(data),
+            "next_cursor": encode_cursor(cursor),
+            "next_page_cursor": encode_page_cursor(data[-1]) if has_more else None,
+        })
 
     # POST
+    # 재전송된 요청이면 주문/번호를 건드리지 않고 처음 응답을 그대로 돌려준다.
+    idem_key = (request.headers.get("Idempotency-Key") or "").strip()
+    fingerprint = None
+    if idem_key:
+        if len(idem_key) > MAX_KEY_LENGTH:
+            return HttpResponseBadRequest("Idempotency-Key가 너무 깁니다(최대 64자).")
+        fingerprint = request_fingerprint(request.body)
+        stored = find_idempotent_response(idem_key)
+        if stored is not None:
+            return _replay_response(stored, fingerprint)
+
     try:
         p = _parse_json(request)
     except ValueError as e:
         return HttpResponseBadRequest(str(e))
 
+    try:
+        order, item_objects = _build_order(p)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    if order.client_uuid:
+        # 응답을 못 받은 단말이 같은 주문을 다시 보낸 경우: 이미 만든 주문을 돌려준다.
+        existing = _existing_order_response(order.client_uuid)
+        if existing is not None:
+            return existing
+
+    body = b""
+
+    def remember(created: Order) -> None:
+        # 응답 본문을 주문과 같은 트랜잭션에 저장해야 재생 결과가 항상 실제 주문과 일치한다.
+        nonlocal body
+        body = dumps(_serialize_order(created))
+        remember_response(idem_key, fingerprint, created, body)
+
+    try:
+        create_order(order, item_objects, on_created=remember if idem_key else None)
+    except IntegrityError as exc:
+        # 같은 주문이 동시에 들어와 졌다면(키 또는 client_uuid 중복) 먼저 커밋된 쪽을 돌려준다.
+        # order.html은 client_uuid를 키로도 보내므로 보통 주문 INSERT의 client_uuid 제약에서 먼저 걸린다.
+        if is_key_conflict(exc) or (order.client_uuid and is_client_uuid_conflict(exc)):
+            stored = find_idempotent_response(idem_key) if idem_key else None
+            if stored is not None:
+                return _replay_response(stored, fingerprint)
+            existing = _existing_order_response(order.client_uuid) if order.client_uuid else None
+            if existing is not None:
+                return existing
+        raise
+    return HttpResponse(body or dumps(_serialize_order(order)), content_type="application/json", status=201)
+
+
+def _existing_order_response(client_uuid) -> HttpResponse | None:
+    existing = _order_base_queryset().filter(client_uuid=client_uuid).first()
+    if existing is None:
+        return None
+    return json_response(_serialize_order(existing))
+
+
+def _active_menu_map(ids) -> Dict[int, MenuItem]:
+    return {m.id: m for m in MenuItem.objects.filter(id__in=set(ids), is_active=True)}
+
+
+def _build_order(p: Dict[str, Any], menu_map: Dict[int, MenuItem] | None = None) -> tuple[Order, List[OrderItem]]:
+    """
+    Validate one order payload and return the unsaved order and items.
+
+    Raises ValueError with a user-facing message. ``menu_map`` lets a batch load the
+    active menus once; otherwise they are fetched for this payload.
+    """
     floor = (p.get("floor") or FloorChoices.B1).upper()
     order_type = (p.get("order_type") or "").upper()
     items = p.get("items") or []                      # [{menu_item_id, qty}, ...]
     note = (p.get("note") or "").strip()
 
     if floor != FloorChoices.B1:
-        return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
+        raise ValueError("floor 파라미터는 B1만 허용됩니다.")
     if order_type not in (OrderType.DINE_IN, OrderType.TAKEOUT):
-        return HttpResponseBadRequest("order_type이 유효하지 않습니다.")
+        raise ValueError("order_type이 유효하지 않습니다.")
 
     # 지하 주문서 확장 필드
     is_takeout = bool(p.get("is_takeout", order_type == OrderType.TAKEOUT))
@@ -193,31 +412,34 @@ def orders_collection(request: HttpRequest):
     received_cash_amount = p.get("received_cash_amount", None)
     received_ticket_amount = p.get("received_ticket_amount", None)
     if payment_method not in (PaymentMethod.CASH, PaymentMethod.TICKET, PaymentMethod.CASH_TICKET):
-        return HttpResponseBadRequest("payment_method 값이 유효하지 않습니다.")
+        raise ValueError("payment_method 값이 유효하지 않습니다.")
 
     # 테이블 (지하 매장 전용 규칙)
     table = None
     table_number_raw = (p.get("table_number") or "").strip()
     if order_type == OrderType.DINE_IN and not is_takeout:
         if not table_number_raw:
-            return HttpResponseBadRequest("매장 주문은 테이블 번호가 필요합니다(포장 제외).")
+            raise ValueError("매장 주문은 테이블 번호가 필요합니다(포장 제외).")
         try:
-            table = _get_table_by_number(int(table_number_raw))
-        except Exception:
-            return HttpResponseBadRequest("유효한 테이블 번호가 아닙니다.")
+            table_ref = get_table_ref(int(table_number_raw))
+        except ValueError:
+            table_ref = None
+        if table_ref is None:
+            raise ValueError("유효한 테이블 번호가 아닙니다.")
+        table = table_ref.as_instance()
     elif order_type == OrderType.TAKEOUT:
         if not table_number_raw:
-            return HttpResponseBadRequest("포장 주문은 101~120 번호를 입력해야 합니다.")
+            raise ValueError("포장 주문은 101~120 번호를 입력해야 합니다.")
         try:
             table_no = int(table_number_raw)
         except ValueError:
-            return HttpResponseBadRequest("포장 주문 번호는 숫자여야 합니다.")
+            raise ValueError("포장 주문 번호는 숫자여야 합니다.")
         if not (101 <= table_no <= 120):
-            return HttpResponseBadRequest("포장 주문 번호는 101~120 범위여야 합니다.")
-        try:
-            table = _get_table_by_number(table_no)
-        except Table.DoesNotExist:
-            return HttpResponseBadRequest("등록되지 않은 포장 번호입니다.")
+            raise ValueError("포장 주문 번호는 101~120 범위여야 합니다.")
+        table_ref = get_table_ref(table_no)
+        if table_ref is None:
+            raise ValueError("등록되지 않은 포장 번호입니다.")
+        table = table_ref.as_instance()
 
     def _to_int(value):
         if value in (None, ""):
@@ -256,18 +478,18 @@ def orders_collection(request: HttpRequest):
                 if cash_value is None or ticket_value is None:
                     raise ValueError
     except ValueError:
-        return HttpResponseBadRequest("금액 입력이 올바르지 않습니다.")
+        raise ValueError("금액 입력이 올바르지 않습니다.")
 
     cash_value = int(cash_value or 0)
     ticket_value = int(ticket_value or 0)
     if payment_method == PaymentMethod.CASH_TICKET and (cash_value <= 0 or ticket_value <= 0):
-        return HttpResponseBadRequest("현금과 티켓 금액을 모두 입력하세요.")
+        raise ValueError("현금과 티켓 금액을 모두 입력하세요.")
 
     total_received = cash_value + ticket_value
 
     # 아이템 파싱/검증
     if not isinstance(items, list) or not items:
-        return HttpResponseBadRequest("items 배열이 필요합니다.")
+        raise ValueError("items 배열이 필요합니다.")
     parsed: List[tuple[int, int, str]] = []
     id_list: List[int] = []
     for row in items:
@@ -275,71 +497,165 @@ def orders_collection(request: HttpRequest):
             mid = int(row.get("menu_item_id"))
             qty = int(row.get("qty"))
         except Exception:
-            return HttpResponseBadRequest("menu_item_id/qty 형식 오류")
+            raise ValueError("menu_item_id/qty 형식 오류")
         if qty < 1:
-            return HttpResponseBadRequest("qty는 1 이상")
+            raise ValueError("qty는 1 이상")
         mode = (row.get("mode") or row.get("service_mode") or order_type).upper()
         if mode not in (OrderType.DINE_IN, OrderType.TAKEOUT):
-            return HttpResponseBadRequest("mode/service_mode 값이 유효하지 않습니다.")
+            raise ValueError("mode/service_mode 값이 유효하지 않습니다.")
         parsed.append((mid, qty, mode))
         id_list.append(mid)
 
-    mi_map = {m.id: m for m in MenuItem.objects.filter(id__in=id_list, is_active=True)}
-    if len(mi_map) != len(set(id_list)):
-        return HttpResponseBadRequest("비활성 또는 존재하지 않는 메뉴가 포함되어 있습니다.")
+    if menu_map is None:
+        menu_map = _active_menu_map(id_list)
+    if any(mid not in menu_map for mid in id_list):
+        raise ValueError("비활성 또는 존재하지 않는 메뉴가 포함되어 있습니다.")
+    mi_map = menu_map
 
     # 스코프별 허용 메뉴
     for mid, _, mode in parsed:
         m = mi_map[mid]
         if not m.visible_kitchen:
-            return HttpResponseBadRequest("주방 메뉴만 선택 가능합니다.")
+            raise ValueError("주방 메뉴만 선택 가능합니다.")
 
     source_raw = (p.get("source") or OrderSource.COUNTER).upper()
     if source_raw not in OrderSource.values:
         source_raw = OrderSource.COUNTER
 
-    with transaction.atomic():
-        order = Order.objects.create(
-            floor=floor,
-            order_type=order_type,
-            status=OrderStatus.PREPARING,
-            source=source_raw,
-            table=table,
-            is_takeout=is_takeout,
-            payment_method=payment_method,
-            received_amount=total_received or None,
-            received_cash_amount=cash_value or None,
-            received_ticket_amount=ticket_value or None,
-            note=note[:200],
+    # 오프라인 큐에서 온 주문: 단말이 만든 UUID/시각(없으면 생략)
+    client_uuid = None
+    if p.get("client_uuid"):
+        try:
+            client_uuid = uuid.UUID(str(p["client_uuid"]))
+        except ValueError:
+            raise ValueError("client_uuid 형식이 올바르지 않습니다.")
+    client_created_at = None
+    if p.get("client_created_at"):
+        try:
+            client_created_at = parse_datetime(str(p["client_created_at"]))
+        except ValueError:
+            client_created_at = None
+        if client_created_at is None:
+            raise ValueError("client_created_at 형식이 올바르지 않습니다.")
+        if timezone.is_naive(client_created_at):
+            client_created_at = timezone.make_aware(client_created_at)
+
+    order = Order(
+        floor=floor,
+        order_type=order_type,
+        status=OrderStatus.PREPARING,
+        source=source_raw,
+        table=table,
+        is_takeout=is_takeout,
+        payment_method=payment_method,
+        received_amount=total_received or None,
+        received_cash_amount=cash_value or None,
+        received_ticket_amount=ticket_value or None,
+        note=note[:200],
+        client_uuid=client_uuid,
+        client_created_at=client_created_at,
+    )
+    item_objects = [
+        OrderItem(
+            menu_item=mi_map[mid],
+            qty=qty,
+            unit_price=mi_map[mid].price,
+            service_mode=mode,
         )
-        item_objects = [
-            OrderItem(
-                order=order,
-                menu_item=mi_map[mid],
-                qty=qty,
-                unit_price=mi_map[mid].price,
-                service_mode=mode,
-            )
-            for mid, qty, mode in parsed
-        ]
-        OrderItem.objects.bulk_create(item_objects, batch_size=len(item_objects) or 1)
+        for mid, qty, mode in parsed
+    ]
+    return order, item_objects
 
-        total_price = sum(
-            (mi_map[mid].price or 0) * qty for mid, qty, _ in parsed
-        )
-        Order.objects.filter(pk=order.pk).update(total_price=total_price)
-        order.total_price = total_price
 
-        allocate_floor_order_no(order)  # 층별 일자 카운터 부여
+SYNC_BATCH_MAX = 100
 
-        created_items = list(
-            OrderItem.objects.select_related("menu_item")
-            .filter(order=order)
-            .order_by("id")
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def orders_sync(request: HttpRequest):
+    """
+    Create a tablet's offline backlog (``{"orders": [...]}``) in one round trip.
+
+    Each entry is a normal order payload plus ``client_uuid`` and ``client_created_at``.
+    Valid entries are created in one transaction, numbered in list order; entries whose
+    ``client_uuid`` already exists are reported as duplicates, so re-sending is safe.
+    """
+    try:
+        p = _parse_json(request)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    entries = p.get("orders")
+    if not isinstance(entries, list) or not entries:
+        return HttpResponseBadRequest("orders 배열이 필요합니다.")
+    if len(entries) > SYNC_BATCH_MAX:
+        return HttpResponseBadRequest(f"한 번에 최대 {SYNC_BATCH_MAX}건까지 동기화할 수 있습니다.")
+    if not all(isinstance(row, dict) for row in entries):
+        return HttpResponseBadRequest("orders 항목 형식 오류")
+
+    # 메뉴는 배치 전체에 대해 한 번만 조회한다(테이블은 프로세스 레지스트리 사용).
+    menu_ids = []
+    for row in entries:
+        for item in row.get("items") or []:
+            try:
+                menu_ids.append(int(item.get("menu_item_id")))
+            except (AttributeError, TypeError, ValueError):
+                pass
+    menu_map = _active_menu_map(menu_ids)
+
+    results: List[Dict[str, Any]] = []
+    pending: List[tuple[Dict[str, Any], Order, List[OrderItem]]] = []
+    seen = set()
+    for row in entries:
+        result: Dict[str, Any] = {"client_uuid": row.get("client_uuid"), "status": "created"}
+        results.append(result)
+        try:
+            if not row.get("client_uuid"):
+                raise ValueError("client_uuid가 필요합니다.")
+            order, items = _build_order(row, menu_map)
+            if order.client_uuid in seen:
+                raise ValueError("같은 client_uuid가 배치에 중복되어 있습니다.")
+        except ValueError as e:
+            result.update(status="error", error=str(e))
+            continue
+        seen.add(order.client_uuid)
+        result["client_uuid"] = str(order.client_uuid)
+        pending.append((result, order, items))
+
+    existing = {
+        row["client_uuid"]: row
+        for row in Order.objects.filter(client_uuid__in=seen).values("client_uuid", "id", "order_no")
+    }
+    to_create = []
+    for result, order, items in pending:
+        found = existing.get(order.client_uuid)
+        if found:
+            result.update(status="duplicate", order_id=found["id"], order_no=found["order_no"])
+        else:
+            to_create.append((result, order, items))
+
+    try:
+        create_orders([(order, items) for _, order, items in to_create])
+    except IntegrityError:
+        # 같은 큐를 두 요청이 동시에 보냈다: 다시 보내면 이미 들어간 주문은 duplicate로 응답된다.
+        return HttpResponse(
+            "같은 주문이 동시에 동기화되었습니다. 다시 시도하세요.",
+            status=409, content_type="text/plain; charset=utf-8",
         )
+    for result, order, _ in to_create:
+        result.update(order_id=order.id, order_no=order.order_no)
 
-    order._prefetched_objects_cache = {"items": created_items}
-    return JsonResponse(_serialize_order(order), status=201)
+    return json_response({"results": results, "created": len(to_create)})
+
+
+def _replay_response(stored: IdempotencyKey, fingerprint: str) -> HttpResponse:
+    if stored.request_hash != fingerprint:
+        return HttpResponse(
+            "같은 Idempotency-Key로 다른 주문 내용이 전송되었습니다.",
+            status=422, content_type="text/plain; charset=utf-8",
+        )
+    response = HttpResponse(stored.response_body, content_type="application/json", status=stored.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
 
 
 # ---------- 상태 변경 ----------
@@ -355,25 +671,11 @@ def order_status(request: HttpRequest, order_id: int):
         return HttpResponseBadRequest("status는 PREPARING/READY/CANCELLED만 허용됩니다.")
 
     try:
-        order = _order_base_queryset().get(id=order_id)
+        order = set_order_status(order_id, new_status)
     except Order.DoesNotExist:
         raise Http404("주문이 존재하지 않습니다.")
 
-    order.status = new_status
-
-    order.save(update_fields=["status", "updated_at"])
-
-    return JsonResponse({"id": order.id, "status": order.status}, status=200)
-
-
-def _sync_order_status_from_items(order: Order) -> None:
-    if order.status == OrderStatus.CANCELLED:
-        return
-    remaining_exists = order.items.filter(prepared_qty__lt=F("qty")).exists()
-    desired = OrderStatus.PREPARING if remaining_exists else OrderStatus.READY
-    if order.status != desired:
-        order.status = desired
-        order.save(update_fields=["status", "updated_at"])
+    return json_response({"id": order.id, "status": order.status}, status=200)
 
 
 @csrf_exempt
@@ -389,12 +691,11 @@ def order_item_progress(request: HttpRequest, item_id: int):
 
     try:
         with transaction.atomic():
-            item = (
-                OrderItem.objects.select_related("order", "menu_item")
-                .select_for_update()
-                .get(id=item_id)
-            )
-            order = item.order
+            # 일괄 처리와 같은 순서(주문 -> 품목)로 잠근다. 주문 잠금이 품목 갱신을 직렬화한다.
+            order_id = OrderItem.objects.values_list("order_id", flat=True).get(id=item_id)
+            order = Order.objects.select_for_update().get(id=order_id)
+            item = OrderItem.objects.get(id=item_id, order_id=order.id)
+            item.order = order
             if order.status == OrderStatus.CANCELLED:
                 return HttpResponseBadRequest("취소된 주문입니다.")
 
@@ -411,33 +712,208 @@ def order_item_progress(request: HttpRequest, item_id: int):
             if prepared_qty < 0 or prepared_qty > item.qty:
                 return HttpResponseBadRequest("prepared_qty 범위 오류")
 
-            if prepared_qty != item.prepared_qty:
-                item.prepared_qty = prepared_qty
-                item.save(update_fields=["prepared_qty"])
-
-            # 상태 동기화
-            _sync_order_status_from_items(order)
-            order.refresh_from_db()
-    except OrderItem.DoesNotExist:
+            # 수량 반영 + 주문 카운터/상태 동기화(EXISTS 조회 없이 산술로 판정)
+            set_item_prepared(order, item, prepared_qty, _session_role(request))
+    except (OrderItem.DoesNotExist, Order.DoesNotExist):
         raise Http404("주문 품목이 존재하지 않습니다.")
 
-    return JsonResponse({"id": order.id}, status=200)
+    return json_response({"id": order.id}, status=200)
 
 
-# ---------- 간이 통계(카운터용) ----------
-@require_http_methods(["GET"])
-def stats_menu_counts(request: HttpRequest):
-    floor = (request.GET.get("floor") or FloorChoices.B1).upper()
+def _parse_progress_entries(entries) -> tuple[list[tuple[str, int, Any, Any]], str | None]:
+    if not isinstance(entries, list) or not entries:
+        return [], "updates 배열이 필요합니다."
+    parsed = []
+    for row in entries:
+        if not isinstance(row, dict):
+            return [], "updates 항목 형식 오류"
+        key = "item" if row.get("item_id") is not None else "order"
+        try:
+            target_id = int(row.get("item_id") if key == "item" else row.get("order_id"))
+        except (TypeError, ValueError):
+            return [], "item_id 또는 order_id가 필요합니다."
+        prepared_qty = row.get("prepared_qty") if key == "item" else None
+        done_flag = row.get("done")
+        if prepared_qty is None and done_flag is None:
+            return [], "prepared_qty 또는 done 값이 필요합니다."
+        if prepared_qty is not None:
+            try:
+                prepared_qty = int(prepared_qty)
+            except (TypeError, ValueError):
+                return [], "prepared_qty는 정수여야 합니다."
+        parsed.append((key, target_id, prepared_qty, done_flag))
+    return parsed, None
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def kitchen_progress_batch(request: HttpRequest):
+    """
+    Apply many kitchen progress updates in one transaction.
+
+    Body: ``{"updates": [{"item_id", "prepared_qty"|"done"}, {"order_id", "done"}]}``.
+    Later entries win when they touch the same item. Cancelled orders are skipped.
+    """
+    try:
+        payload = _parse_json(request)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    entries = payload if isinstance(payload, list) else payload.get("updates")
+    parsed, error = _parse_progress_entries(entries)
+    if error:
+        return HttpResponseBadRequest(error)
+
+    item_ids = {target_id for key, target_id, *_ in parsed if key == "item"}
+    done_order_ids = {target_id for key, target_id, *_ in parsed if key == "order"}
+
+    with transaction.atomic():
+        item_orders = dict(OrderItem.objects.filter(id__in=item_ids).values_list("id", "order_id"))
+        if len(item_orders) != len(item_ids):
+            return HttpResponseBadRequest("존재하지 않는 주문 품목이 포함되어 있습니다.")
+        order_ids = set(item_orders.values()) | done_order_ids
+        # 주문 행을 id 순서로 잠가 단건 PATCH와 동시에 와도 카운터가 어긋나지 않게 한다.
+        orders = {
+            o.id: o
+            for o in Order.objects.select_for_update().filter(id__in=order_ids).order_by("id")
+        }
+        if not done_order_ids <= orders.keys():
+            return HttpResponseBadRequest("존재하지 않는 주문이 포함되어 있습니다.")
+        skipped = sorted(oid for oid, o in orders.items() if o.status == OrderStatus.CANCELLED)
+        for oid in skipped:
+            del orders[oid]
+
+        items = list(
+            OrderItem.objects.filter(Q(id__in=item_ids) | Q(order_id__in=done_order_ids))
+            .filter(order_id__in=orders.keys())
+            .only("id", "order_id", "menu_item_id", "qty", "prepared_qty")
+        )
+        by_id = {i.id: i for i in items}
+        by_order: Dict[int, List[OrderItem]] = {}
+        for i in items:
+            by_order.setdefault(i.order_id, []).append(i)
+
+        targets: Dict[int, int] = {}
+        for key, target_id, prepared_qty, done_flag in parsed:
+            if key == "order":
+                for i in by_order.get(target_id, []):
+                    targets[i.id] = i.qty if bool(done_flag) else 0
+                continue
+            item = by_id.get(target_id)
+            if item is None:  # 취소된 주문의 품목
+                continue
+            if prepared_qty is None:
+                prepared_qty = item.qty if bool(done_flag) else 0
+            if prepared_qty < 0 or prepared_qty > item.qty:
+                return HttpResponseBadRequest(f"prepared_qty 범위 오류 (item {target_id})")
+            targets[target_id] = prepared_qty
+
+        changed = apply_prepared_targets(orders, items, targets, _session_role(request))
+
+    return json_response({
+        "orders": [
+            {"id": o.id, "status": o.status, "remaining_qty": o.remaining_qty}
+            for o in sorted(orders.values(), key=lambda o: o.id)
+        ],
+        "ready": [o.id for o in changed if o.status == OrderStatus.READY],
+        "skipped": skipped,
+    }, status=200)
+
+
+def _allocatable_orders(menu_item_id: int, floor: str, day):
+    """Ids of the day's PREPARING orders with an unfinished line of ``menu_item_id``."""
+    return (
+        OrderItem.objects.filter(
+            menu_item_id=menu_item_id,
+            prepared_qty__lt=F("qty"),
+            order__status=OrderStatus.PREPARING,
+            order__floor=floor,
+            order__order_date=day,
+        )
+        .exclude(order__status=OrderStatus.CANCELLED)  # ord_active_day_idx 사용(SQLite)
+        .values("order_id")
+    )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def kitchen_allocate(request: HttpRequest):
+    """
+    Distribute a cooked batch of one menu item over pending orders, oldest first.
+
+    Body: ``{"menu_item_id": int, "qty": int, "floor": "B1"}``. Quantity that no
+    pending item can take is returned as ``unallocated``.
+    """
+    try:
+        payload = _parse_json(request)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    floor = (payload.get("floor") or FloorChoices.B1).upper()
     if floor != FloorChoices.B1:
         return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
+    try:
+        menu_item_id = int(payload.get("menu_item_id"))
+        qty = int(payload.get("qty"))
+    except (TypeError, ValueError):
+        return HttpResponseBadRequest("menu_item_id/qty 형식 오류")
+    if qty < 1:
+        return HttpResponseBadRequest("qty는 1 이상")
 
     today = timezone.localdate()
-    qs = (
+    with transaction.atomic():
+        # 대상 주문을 id 순서로 먼저 잠근 뒤 품목을 읽어야 단건/일괄 PATCH와 엇갈리지 않는다.
+        pending_orders = _allocatable_orders(menu_item_id, floor, today)
+        orders = {
+            o.id: o
+            for o in Order.objects.select_for_update()
+            .filter(id__in=pending_orders, status=OrderStatus.PREPARING)
+            .order_by("id")
+        }
+        items = list(
+            OrderItem.objects.filter(
+                order_id__in=orders.keys(),
+                menu_item_id=menu_item_id,
+                prepared_qty__lt=F("qty"),
+            )
+            .order_by("order__created_at", "order_id", "id")
+            .only("id", "order_id", "menu_item_id", "qty", "prepared_qty")
+        )
+
+        left = qty
+        targets: Dict[int, int] = {}
+        allocated: Dict[int, int] = {}
+        for item in items:
+            if left <= 0:
+                break
+            take = min(left, item.qty - item.prepared_qty)
+            targets[item.id] = item.prepared_qty + take
+            allocated[item.order_id] = allocated.get(item.order_id, 0) + take
+            left -= take
+
+        touched = {oid: orders[oid] for oid in allocated}
+        changed = apply_prepared_targets(touched, items, targets, _session_role(request))
+
+    return json_response({
+        "menu_item_id": menu_item_id,
+        "allocated": qty - left,
+        "unallocated": left,
+        "orders": [{"id": oid, "qty": n} for oid, n in allocated.items()],
+        "ready": [
+            {"id": o.id, "order_no": o.order_no}
+            for o in changed if o.status == OrderStatus.READY
+        ],
+    }, status=200)
+
+
+# ---------- 간이 통계(카운터용) ----------
+def _menu_counts_queryset(floor: str, day):
+    # exclude(CANCELLED)는 status__in과 중복이지만 SQLite가 ord_active_day_idx를 고르게 한다.
+    return (
         OrderItem.objects.filter(
             order__floor=floor,
             order__status__in=[OrderStatus.PREPARING, OrderStatus.READY],
-            order__order_date=today,
+            order__order_date=day,
         )
+        .exclude(order__status=OrderStatus.CANCELLED)
         .values("menu_item__name")
         .annotate(
             qty_sum=Sum("qty"),
@@ -446,11 +922,21 @@ def stats_menu_counts(request: HttpRequest):
         .order_by("-qty_sum", "menu_item__name")
     )
 
-    data = [
+
+@require_http_methods(["GET"])
+def stats_menu_counts(request: HttpRequest):
+    floor = (request.GET.get("floor") or FloorChoices.B1).upper()
+    if floor != FloorChoices.B1:
+        return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
+
+    return json_response({"items": _menu_count_items(floor, timezone.localdate())}, status=200)
+
+
+def _menu_count_items(floor: str, day) -> List[Dict[str, Any]]:
+    return [
         {"name": r["menu_item__name"], "qty": r["qty_sum"], "amount": r["amount"] or 0}
-        for r in qs
+        for r in _menu_counts_queryset(floor, day)
     ]
-    return JsonResponse({"items": data}, status=200)
 
 
 @require_http_methods(["GET"])
@@ -459,100 +945,159 @@ def kitchen_menu_summary(request: HttpRequest):
     if floor != FloorChoices.B1:
         return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
 
-    today = timezone.localdate()
-    qs = OrderItem.objects.filter(
-        order__status=OrderStatus.PREPARING,
-        order__floor=floor,
-        order__order_date=today,
-    ).values("menu_item_id", "menu_item__name")
-
-    qs = qs.annotate(
-        pending=Sum(F("qty") - F("prepared_qty"), output_field=IntegerField()),
-    ).filter(pending__gt=0).order_by("-pending", "menu_item__name")
-
-    data = [
-        {"menu_item_id": r["menu_item_id"], "name": r["menu_item__name"], "pending": r["pending"]}
-        for r in qs
+    return json_response({"items": _menu_pending_items(floor, timezone.localdate())}, status=200)
+
+
+def _menu_pending_queryset(floor: str, day):
+    # 주문/조리 변경 때 함께 갱신되는 메뉴별 집계 행만 읽는다(rebuild_menu_counters로 재계산).
+    return (
+        MenuDayCounter.objects.filter(date=day, floor=floor, pending_qty__gt=0)
+        .values("menu_item_id", "menu_item__name", "pending_qty")
+        .order_by("-pending_qty", "menu_item__name")
+    )
+
+
+def _menu_pending_items(floor: str, day) -> List[Dict[str, Any]]:
+    return [
+        {"menu_item_id": r["menu_item_id"], "name": r["menu_item__name"], "pending": r["pending_qty"]}
+        for r in _menu_pending_queryset(floor, day)
     ]
-    return JsonResponse({"items": data}, status=200)
+
+
+def _active_orders(floor: str, day):
+    # 오늘 취소 제외 주문: ord_active_day_idx(SQLite는 제외 조건을 명시해야 부분 인덱스를 탄다)
+    return Order.objects.filter(order_date=day, floor=floor).exclude(status=OrderStatus.CANCELLED)
+
+
+def _headline_counters(floor: str, day) -> Dict[str, int]:
+    active = _active_orders(floor, day).aggregate(
+        preparing=Count("id", filter=Q(status=OrderStatus.PREPARING)),
+        ready=Count("id", filter=Q(status=OrderStatus.READY)),
+    )
+    sales = SalesHourly.objects.filter(date=day, floor=floor).aggregate(
+        orders=Sum("orders"), revenue=Sum("revenue"),
+    )
+    return {
+        "preparing": active["preparing"],
+        "ready": active["ready"],
+        "orders": sales["orders"] or 0,
+        "revenue": sales["revenue"] or 0,
+    }
+
+
+@contextmanager
+def _read_snapshot():
+    """One transaction in which every read sees the same committed state."""
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            # READ COMMITTED는 문장마다 스냅샷을 새로 잡는다(SET TRANSACTION은 첫 쿼리 전에만 가능).
+            # SQLite는 트랜잭션의 첫 읽기부터 커밋까지 같은 스냅샷을 본다.
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        yield
+
+
+# 역할별 보드 스냅샷의 메뉴 집계: 주방은 남은 조리 수량, 카운터는 오늘 판매 수량.
+BOARD_MENU_SECTIONS = {
+    "KITCHEN": ("menu_summary", _menu_pending_items),
+    "KITCHEN_HALL": ("menu_summary", _menu_pending_items),
+    "KITCHEN_TAKEOUT": ("menu_summary", _menu_pending_items),
+    "B1_COUNTER": ("menu_counts", _menu_count_items),
+}
+
+
+@require_http_methods(["GET"])
+def board_snapshot(request: HttpRequest):
+    """
+    Orders, the per-menu summary and headline counters for one screen in one response.
+
+    Everything is read in a single transaction, so the sections agree with each other.
+    Order filters are those of ``orders_collection`` (floor/status/types/scope/limit) and
+    ``next_cursor`` continues with its ``since`` deltas. ``role`` defaults to the session role.
+    """
+    role = (request.GET.get("role") or _session_role(request)).upper()
+    if role not in BOARD_MENU_SECTIONS:
+        return HttpResponseBadRequest("role은 " + "/".join(BOARD_MENU_SECTIONS) + "만 허용됩니다.")
+    qs, error = _order_list_queryset(request)
+    if error:
+        return HttpResponseBadRequest(error)
+    limit = _list_limit(request)
+    section, menu_items = BOARD_MENU_SECTIONS[role]
+    floor = FloorChoices.B1
+    today = timezone.localdate()
+
+    with _read_snapshot():
+        cursor = latest_seq()
+        data = serialize_order_rows(qs[:limit])
+        menu = menu_items(floor, today)
+        counters = _headline_counters(floor, today)
+    return json_response({
+        "role": role,
+        "results": data,
+        "count": len(data),
+        "next_cursor": encode_cursor(cursor),
+        section: menu,
+        "counters": counters,
+    })
 
 
 @require_http_methods(["GET"])
+@conditional_get(_order_validators)
 def order_detail(request: HttpRequest, order_id: int):
-    try:
-        order = _order_base_queryset().get(id=order_id)
-    except Order.DoesNotExist:
+    data = serialize_order_rows(Order.objects.filter(id=order_id))
+    if not data:
         raise Http404("주문이 존재하지 않습니다.")
-    return JsonResponse(_serialize_order(order), status=200)
+    return json_response(data[0], status=200)
 
 
 @require_http_methods(["GET"])
 def stats_dashboard(request: HttpRequest):
-    orders_qs, start_date, end_date = _filtered_orders(request)
-    floor = (request.GET.get("floor") or "").upper()
-    if floor:
-        if floor not in FloorChoices.values:
-            return HttpResponseBadRequest("유효하지 않은 floor 값입니다.")
-        orders_qs = orders_qs.filter(floor=floor)
+    """
+    Sales summary for ``start_date``..``end_date`` (inclusive, YYYY-MM-DD; open ends allowed).
 
-    items_filters = {
-        "order__status__in": [OrderStatus.PREPARING, OrderStatus.READY],
-    }
+    Answered from the hourly/menu rollups (check_sales_rollups verifies them against
+    the raw orders), so the cost depends on the number of buckets, not orders.
+    """
+    (start_date, end_date, floor), error = _stats_period(request)
+    if error:
+        return HttpResponseBadRequest(error)
+
+    filters = {}
     if start_date:
-        items_filters["order__order_date__gte"] = start_date
+        filters["date__gte"] = start_date
     if end_date:
-        items_filters["order__order_date__lte"] = end_date
+        filters["date__lte"] = end_date
     if floor:
-        items_filters["order__floor"] = floor
-
-    totals = orders_qs.aggregate(
-        total_revenue=Sum("total_price"),
-        cash_total=Sum("received_cash_amount"),
-        ticket_total=Sum("received_ticket_amount"),
-        order_count=Count("id"),
+        filters["floor"] = floor
+    hourly_qs = SalesHourly.objects.filter(**filters)
+    menu_qs = SalesMenuDaily.objects.filter(**filters)
+
+    totals = hourly_qs.aggregate(
+        total_revenue=Sum("revenue"),
+        cash_total=Sum("cash_amount"),
+        ticket_total=Sum("ticket_amount"),
+        order_count=Sum("orders"),
     )
     total_orders = totals.get("order_count") or 0
     total_revenue = totals.get("total_revenue") or 0
     cash_total = totals.get("cash_total") or 0
     ticket_total = totals.get("ticket_total") or 0
 
-    items_qs = OrderItem.objects.filter(**items_filters)
-    item_totals = items_qs.aggregate(
-        item_count=Sum("qty"),
-        item_revenue=Sum(F("qty") * F("unit_price"), output_field=IntegerField()),
-    )
-    total_items = item_totals.get("item_count") or 0
-
     menu_breakdown = list(
-        items_qs.values("menu_item__name")
-        .annotate(
-            qty=Sum("qty"),
-            amount=Sum(F("qty") * F("unit_price"), output_field=IntegerField()),
-        )
-        .order_by("-qty", "menu_item__name")
+        menu_qs.values("menu_item__name")
+        .annotate(qty_sum=Sum("qty"), amount_sum=Sum("amount"))
+        .filter(qty_sum__gt=0)
+        .order_by("-qty_sum", "menu_item__name")
     )
+    total_items = sum(row["qty_sum"] or 0 for row in menu_breakdown)
 
     hourly = list(
-        orders_qs.annotate(hour=TruncHour("created_at"))
-        .values("hour")
-        .annotate(
-            orders=Count("id"),
-            revenue=Sum("total_price"),
-        )
-        .order_by("hour")
+        hourly_qs.values("date", "hour")
+        .annotate(orders_sum=Sum("orders"), revenue_sum=Sum("revenue"))
+        .filter(orders_sum__gt=0)
+        .order_by("date", "hour")
     )
-    current_tz = timezone.get_current_timezone()
-    for row in hourly:
-        hour = row["hour"]
-        if hour:
-            if timezone.is_naive(hour):
-                hour = timezone.make_aware(hour, timezone.utc)
-            hour_local = hour.astimezone(current_tz)
-            row["hour_label"] = hour_local.strftime("%H:%M")
-        else:
-            row["hour_label"] = ""
-        row["orders"] = row["orders"] or 0
-        row["revenue"] = row["revenue"] or 0
 
     total_payment = cash_total + ticket_total
     payment_breakdown = {
@@ -577,18 +1122,42 @@ def stats_dashboard(request: HttpRequest):
         "menu": [
             {
                 "name": row["menu_item__name"],
-                "qty": row["qty"],
-                "amount": row["amount"] or 0,
+                "qty": row["qty_sum"],
+                "amount": row["amount_sum"] or 0,
             }
             for row in menu_breakdown
         ],
         "hourly": [
             {
-                "hour": row["hour_label"],
-                "orders": row["orders"],
-                "revenue": row["revenue"],
+                "date": row["date"].isoformat(),
+                "hour": f"{row['hour']:02d}:00",
+                "orders": row["orders_sum"],
+                "revenue": row["revenue_sum"] or 0,
             }
             for row in hourly
         ],
     }
-    return JsonResponse(response, status=200)
+    return json_response(response, status=200)
+
+
+@require_http_methods(["GET"])
+def stats_prep_times(request: HttpRequest):
+    """
+    Per-menu prep time (order created -> item prepared) for ``start_date``..``end_date``.
+
+    Built from the item progress events: average, p50/p90 (bucket bounds, seconds),
+    a histogram over ``bucket_minutes`` (last bucket = longer) and an hourly breakdown.
+    """
+    (start_date, end_date, floor), error = _stats_period(request)
+    if error:
+        return HttpResponseBadRequest(error)
+
+    return json_response({
+        "period": {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "floor": floor or None,
+        },
+        "bucket_minutes": list(BUCKET_MINUTES),
+        "menu": prep_time_stats(start_date, end_date, floor),
+    }, status=200)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+import hmac
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_http_methods
+
+from orders.services.metrics import render_metrics
+
+
+def _metrics_allowed(request: HttpRequest) -> bool:
+    token = getattr(settings, "ORDERS_METRICS_TOKEN", "")
+    auth = request.headers.get("Authorization") or ""
+    if token and auth.startswith("Bearer ") and hmac.compare_digest(auth[7:].strip(), token):
+        return True
+    role = (request.session.get("role") or "").upper()
+    return role in {r.upper() for r in getattr(settings, "ORDERS_METRICS_ROLES", ())}
+
+
+@require_http_methods(["GET"])
+def metrics(request: HttpRequest):
+    """Prometheus scrape target: ``Authorization: Bearer <ORDERS_METRICS_TOKEN>`` or an allowed session role."""
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden("메트릭 조회 권한이 없습니다.")
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import json
+from functools import wraps
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+try:  # 선택 의존성: 설치되어 있으면 사용
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _dumps_stdlib(data: Any) -> bytes:
+    # ensure_ascii=False는 CPython에서 인코딩과 UTF-8 변환이 모두 느려져(200건 보드 기준 JsonResponse보다
+    # 느렸다) 기본 이스케이프를 유지하고 구분자 공백만 줄인다. 한글 절감이 필요하면 orjson을 쓴다.
+    return json.dumps(data, separators=(",", ":"), cls=DjangoJSONEncoder).encode("ascii")
+
+
+def _dumps_orjson(data: Any) -> bytes:
+    # 날짜/시간은 표준 백엔드와 같은 형식이 되도록 DjangoJSONEncoder에 맡긴다.
+    return orjson.dumps(
+        data,
+        default=_django_encoder.default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+BACKENDS: dict[str, Callable[[Any], bytes]] = {"stdlib": _dumps_stdlib}
+if orjson is not None:
+    BACKENDS["orjson"] = _dumps_orjson
+
+
+def get_dumps(name: str | None = None) -> Callable[[Any], bytes]:
+    """Return the encoder for ``name`` (``auto``/``stdlib``/``orjson``), falling back to stdlib."""
+    name = (name or getattr(settings, "ORDERS_JSON_BACKEND", "auto")).lower()
+    if name == "auto":
+        name = "orjson" if "orjson" in BACKENDS else "stdlib"
+    return BACKENDS.get(name, _dumps_stdlib)
+
+
+def dumps(data: Any) -> bytes:
+    return get_dumps()(data)
+
+
+def json_response(data: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(dumps(data), content_type="application/json", status=status)
+
+
+def conditional_get(compute: Callable[..., tuple[str | None, Any]]):
+    """
+    ``condition()`` for GET endpoints whose validators come from one cheap query.
+
+    ``compute(request, *args, **kwargs)`` returns ``(etag, last_modified)`` and runs
+    at most once per request; a matching ``If-None-Match`` answers 304 before the
+    view serializes anything. Responses are marked ``no-cache`` so browsers always
+    revalidate instead of reusing a stale copy.
+    """
+    def _validators(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return None, None
+        if not hasattr(request, "_orders_validators"):
+            request._orders_validators = compute(request, *args, **kwargs) or (None, None)
+        return request._orders_validators
+
+    def decorator(view):
+        conditional_view = condition(
+            etag_func=lambda r, *a, **k: _validators(r, *a, **k)[0],
+            last_modified_func=lambda r, *a, **k: _validators(r, *a, **k)[1],
+        )(view)
+
+        @wraps(view)
+        def _wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD") and response.status_code in (200, 304):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return _wrapped
+    return decorator
@@ -0,0 +1,150 @@
+from __future__ import annotations
+import threading
+import time
+from typing import Iterator
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import require_http_methods
+
+from orders.models import FloorChoices, Order
+from orders.services.changes import (
+    changes_since, cursor_is_stale, decode_cursor, encode_cursor, latest_seq,
+)
+from orders.services.order_rows import serialize_order_rows
+from orders.services.realtime import current_generation, wait_for_change
+from .responses import dumps
+
+STREAM_BATCH = 100
+HEARTBEAT_SECONDS = 15.0
+
+
+def _stream_poll_seconds() -> float:
+    return float(getattr(settings, "ORDERS_STREAM_POLL_SECONDS", 1.0))
+
+
+def _stream_max_seconds() -> float:
+    return float(getattr(settings, "ORDERS_STREAM_MAX_SECONDS", 300.0))
+
+
+def _stream_max_per_process() -> int:
+    return int(getattr(settings, "ORDERS_STREAM_MAX_PER_PROCESS", 0))
+
+
+# 프로세스당 열린 스트림 수. 스트림은 요청 스레드(와 DB 연결)를 계속 점유한다.
+_active_streams = 0
+_streams_lock = threading.Lock()
+
+
+def _acquire_stream_slot() -> bool:
+    global _active_streams
+    with _streams_lock:
+        if _active_streams >= _stream_max_per_process():
+            return False
+        _active_streams += 1
+        return True
+
+
+def _release_stream_slot() -> None:
+    global _active_streams
+    with _streams_lock:
+        _active_streams = max(0, _active_streams - 1)
+
+
+class _SlotStream:
+    """Stream body that frees its slot when the server closes the response (even if never iterated)."""
+
+    def __init__(self, events: Iterator[str]):
+        self._events = events
+        self._released = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self) -> None:
+        self._events.close()
+        if not self._released:
+            self._released = True
+            _release_stream_slot()
+
+
+def _sse(event: str, data: dict, event_id: str | None = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + dumps(data).decode("utf-8"))
+    return "\n".join(lines) + "\n\n"
+
+
+def _order_events(floor: str, cursor: int | None) -> Iterator[str]:
+    """
+    Yield SSE frames for orders touched by change-log rows after ``cursor``.
+
+    The stream ends after ``ORDERS_STREAM_MAX_SECONDS`` so a sync worker is not held
+    forever; EventSource reconnects with ``Last-Event-ID`` and resumes from there.
+    """
+    deadline = time.monotonic() + _stream_max_seconds()
+    poll = _stream_poll_seconds()
+    sent: set[int] = set()  # 커서 뒤(빈 번호 뒤)에서 이미 보낸 seq (중복 전송 방지)
+    last_beat = time.monotonic()
+    generation = current_generation()
+
+    if cursor is None:
+        cursor = latest_seq()
+        yield f"retry: 3000\nid: {encode_cursor(cursor)}\n\n"
+    elif cursor_is_stale(cursor):
+        # 보관 기간이 지나 놓친 변경을 알 수 없으므로 클라이언트에게 전체 재조회를 요청한다.
+        cursor = latest_seq()
+        yield "retry: 3000\n\n" + _sse("reset", {}, encode_cursor(cursor))
+    else:
+        yield "retry: 3000\n\n"
+
+    while time.monotonic() < deadline:
+        changed, next_cursor = changes_since(cursor, STREAM_BATCH)
+        fresh = [(seq, order_id) for seq, order_id in changed if seq not in sent]
+        advanced = next_cursor != cursor
+        cursor = next_cursor
+        # 커서 뒤에 남는 행(빈 번호 뒤)은 다음 조회에서 다시 읽히므로 보낸 seq로 기억한다.
+        sent = {seq for seq, _ in changed if seq > cursor}
+        if fresh:
+            ids = list(dict.fromkeys(order_id for _, order_id in fresh))
+            data = serialize_order_rows(
+                Order.objects.filter(floor=floor, id__in=ids).order_by("created_at", "id")
+            )
+            if data:
+                yield _sse("orders", {"results": data, "count": len(data)}, encode_cursor(cursor))
+                last_beat = time.monotonic()
+            if len(changed) == STREAM_BATCH and advanced:
+                continue
+
+        if time.monotonic() - last_beat >= HEARTBEAT_SECONDS:
+            yield ": ping\n\n"
+            last_beat = time.monotonic()
+        generation = wait_for_change(generation, poll)
+
+
+@require_http_methods(["GET"])
+def orders_stream(request: HttpRequest):
+    floor = (request.GET.get("floor") or FloorChoices.B1).upper()
+    if floor != FloorChoices.B1:
+        return HttpResponseBadRequest("floor 파라미터는 B1만 허용됩니다.")
+
+    raw_cursor = request.headers.get("Last-Event-ID") or request.GET.get("cursor")
+    cursor = decode_cursor(raw_cursor)
+    if raw_cursor and cursor is None:
+        return HttpResponseBadRequest("cursor 값이 유효하지 않습니다.")
+
+    if not _acquire_stream_slot():
+        # 한도를 넘은 화면은 EventSource가 닫히면서 delta 폴링으로 전환된다.
+        response = HttpResponse(
+            "실시간 스트림 한도를 초과했습니다. 폴링으로 갱신하세요.",
+            status=503, content_type="text/plain; charset=utf-8",
+        )
+        response["Retry-After"] = "60"
+        return response
+
+    response = StreamingHttpResponse(_SlotStream(_order_events(floor, cursor)), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response